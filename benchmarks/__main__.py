@@ -0,0 +1,124 @@
+import argparse
+import json
+from itertools import cycle, islice
+import platform
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.common import compare, median_of
+from benchmarks.spaces import spaces
+from solver import keypad_engine, solve_many
+from solver.modules import get_module
+from solver.stats import percentile
+from solver.tables import TABLES
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+def bench_module(name: str, inputs: list[tuple], min_calls: int, latency_samples: int) -> dict:
+    build = 0.0
+    table = TABLES.get(name)
+    if table is not None:
+        start = time.perf_counter()
+        table.build()
+        build = time.perf_counter() - start
+
+    # Small spaces are solved several times over so the timings settle
+    calls = inputs * max(1, min_calls // len(inputs))
+    start = time.perf_counter()
+    solve_many(name, calls)
+    elapsed = time.perf_counter() - start
+
+    # Latency is timed call by call on an evenly spread subset
+    solve = get_module(name).solve
+    step = max(1, len(inputs) // latency_samples)
+    timings = []
+    clock = time.perf_counter_ns
+    for args in islice(cycle(inputs[::step]), latency_samples):
+        start_ns = clock()
+        solve(*args)
+        timings.append(clock() - start_ns)
+    timings.sort()
+
+    return {
+        "inputs": len(inputs),
+        "calls": len(calls),
+        "seconds": elapsed,
+        "ops_per_sec": len(calls) / elapsed,
+        "p50_ns": percentile(timings, 0.50),
+        "p99_ns": percentile(timings, 0.99),
+        "build_seconds": build,
+    }
+
+def bench_keypads_sweep(stop: int, chunk: int) -> dict:
+    start = time.perf_counter()
+    for _ in keypad_engine.sweep(0, stop, chunk):
+        pass
+    elapsed = time.perf_counter() - start
+    return {
+        "inputs": stop,
+        "seconds": elapsed,
+        "ops_per_sec": stop / elapsed,
+        "chunk": chunk,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark every module solver")
+    parser.add_argument("modules", nargs="*", help="only benchmark these modules")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"), help="where to write the results")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="the stored results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="the allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--sample", type=int, default=200_000, help="the sample size for spaces too big to enumerate")
+    parser.add_argument("--min-calls", type=int, default=100_000, help="the fewest solves timed per module")
+    parser.add_argument("--repeat", type=int, default=5, help="how many times each module is timed, the median being kept")
+    parser.add_argument("--latency-samples", type=int, default=20_000, help="the number of calls timed one by one")
+    parser.add_argument("--sweep", type=int, default=10_000_000, help="how much of the keypads space to sweep, up to 100^4")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="the keypads sweep chunk size")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "modules": {},
+    }
+
+    for name, space in spaces(args.sample).items():
+        if args.modules and name not in args.modules:
+            continue
+        inputs = space.generate()
+        runs = [bench_module(name, inputs, args.min_calls, args.latency_samples) for _ in range(args.repeat)]
+        result = median_of(runs)
+        # Only the first run builds the table, the others find it built
+        result["build_seconds"] = runs[0]["build_seconds"]
+        result["exhaustive"] = space.exhaustive
+        result["space"] = space.size
+        results["modules"][name] = result
+        print(
+            f"{name:<14} {result['inputs']:>9,} inputs {result['ops_per_sec']:>14,.0f} ops/sec "
+            f"p50 {result['p50_ns']:>6,} ns p99 {result['p99_ns']:>7,} ns"
+        )
+
+    if not args.modules or "keypads-sweep" in args.modules:
+        stop = min(args.sweep, keypad_engine.SPACE_SIZE)
+        sweep = median_of([bench_keypads_sweep(stop, args.chunk) for _ in range(args.repeat)])
+        results["modules"]["keypads-sweep"] = sweep
+        print(f"{'keypads-sweep':<14} {sweep['inputs']:>9,} inputs {sweep['ops_per_sec']:>14,.0f} ops/sec")
+
+    args.output.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Stored the baseline in {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from solver import codec
+
+def round_trip_module(name: str, indexes: range | list[int]) -> dict:
+    """Decode every index and encode it back, timing both directions."""
+    decode = codec.FIELDS[name].decode
+    encode = codec.FIELDS[name].encode
+
+    start = time.perf_counter()
+    inputs = [decode(i) for i in indexes]
+    decoded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoded = [encode(values) for values in inputs]
+    elapsed = time.perf_counter() - start
+
+    mismatches = [(i, values) for i, values, index in zip(indexes, inputs, encoded) if i != index]
+    return {
+        "states": codec.FIELDS[name].size,
+        "checked": len(inputs),
+        "exhaustive": len(inputs) == codec.FIELDS[name].size,
+        "encode_per_sec": len(inputs) / elapsed,
+        "decode_per_sec": len(inputs) / decoded,
+        "mismatches": len(mismatches),
+        "first_mismatch": repr(mismatches[0]) if mismatches else None,
+    }
+
+def round_trip_states(count: int, seed: int) -> dict:
+    """Pack and unpack whole bombs with every module drawn at random."""
+    rng = random.Random(seed)
+    states = [
+        {slot.name: slot.field.decode(rng.randrange(slot.field.size)) for slot in codec.LAYOUT}
+        for _ in range(count)
+    ]
+
+    start = time.perf_counter()
+    packed = [codec.pack(state) for state in states]
+    pack_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    unpacked = [codec.unpack(data) for data in packed]
+    unpack_elapsed = time.perf_counter() - start
+
+    # Unpacking leaves blank modules out
+    mismatches = sum(
+        1 for state, result in zip(states, unpacked)
+        if result != {name: inputs for name, inputs in state.items() if codec.encode_module(name, inputs)}
+    )
+    return {
+        "states": count,
+        "bytes": codec.STATE_BYTES,
+        "pack_per_sec": count / pack_elapsed,
+        "unpack_per_sec": count / unpack_elapsed,
+        "mismatches": mismatches,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.codec", description="Round trip the bomb state codec")
+    parser.add_argument("--limit", type=int, default=2_000_000, help="modules with more states than this are sampled")
+    parser.add_argument("--sample", type=int, default=200_000, help="how many states a sampled module is checked over")
+    parser.add_argument("--bombs", type=int, default=100_000, help="how many whole bombs are packed and unpacked")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-codec-results.json"), help="where to write the results")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    results: dict = {"state_bits": codec.STATE_BITS, "modules": {}}
+    for slot in codec.LAYOUT:
+        size = slot.field.size
+        indexes = range(size) if size <= args.limit else sorted(rng.sample(range(size), args.sample))
+        result = results["modules"][slot.name] = round_trip_module(slot.name, indexes)
+        print(
+            f"{slot.name:<14} {slot.mask.bit_length():>3} bits {result['checked']:>9,} of {size:>17,} "
+            f"encode {result['encode_per_sec']:>12,.0f}/sec decode {result['decode_per_sec']:>12,.0f}/sec "
+            f"{result['mismatches']} mismatches"
+        )
+
+    bombs = results["bombs"] = round_trip_states(args.bombs, args.seed)
+    print(
+        f"{'bombs':<14} {codec.STATE_BITS:>3} bits {bombs['states']:>9,} in {codec.STATE_BYTES} bytes "
+        f"pack {bombs['pack_per_sec']:>12,.0f}/sec unpack {bombs['unpack_per_sec']:>12,.0f}/sec "
+        f"{bombs['mismatches']} mismatches"
+    )
+
+    args.output.write_text(json.dumps(results, indent=2))
+
+    failed = bombs["mismatches"] + sum(result["mismatches"] for result in results["modules"].values())
+    if failed:
+        for name, result in results["modules"].items():
+            if result["first_mismatch"]:
+                print(f"MISMATCH {name}: {result['first_mismatch']}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from solver import code_engine, tables
+
+def sample_codes(name: str, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Codes drawn from the module's own space, with every hundredth one broken."""
+    if name == "hexadecimal":
+        nibbles = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)[rng.integers(0, 16, (count, 8))]
+        matrix = np.full((count, 11), ord("-"), dtype=np.uint8)
+        matrix[:, [0, 1, 3, 4, 6, 7, 9, 10]] = nibbles
+    else:
+        table = tables.TABLES[name]
+        codes = [table.decode(i)[-1] for i in rng.integers(0, table.size, min(count, 100_000)).tolist()]
+        matrix = np.array(codes, dtype=f"S{code_engine.WIDTHS[name]}").view(np.uint8).reshape(len(codes), -1)
+        matrix = np.resize(matrix, (count, matrix.shape[1]))
+    matrix[::100, 0] = ord("?")
+    return matrix.view(f"S{matrix.shape[1]}").ravel()
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.codes", description="Time the batch engine of the typed modules")
+    parser.add_argument("--count", type=int, default=1_000_000, help="how many codes each module is solved for")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-codes-results.json"), help="where to write the results")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    colors = np.zeros(5, dtype=np.int64)
+    results: dict = {"modules": {}}
+    for name, engine in code_engine.ENGINES.items():
+        codes = sample_codes(name, args.count, rng)
+        solve = (lambda codes: engine(codes, colors)) if name == "color-code" else engine
+        solve(codes[:1000])
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            batch = solve(codes)
+            best = min(best, time.perf_counter() - start)
+
+        invalid = int((~batch.valid).sum())
+        result = results["modules"][name] = {"codes": len(codes), "codes_per_sec": len(codes) / best, "invalid": invalid}
+        print(f"{name:<14} {len(codes):>10,} codes {result['codes_per_sec']:>14,.0f} codes/sec {invalid:>8,} invalid")
+
+    args.output.write_text(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import statistics
+from collections.abc import Callable
+from typing import Any
+
+def watch_frames(app: Any, on_frame: Callable[[Any], Any]) -> bool:
+    """Call `on_frame` with the screen of every frame the compositor hands to the driver.
+
+    Headless apps never write their frames out, so this wraps Textual's private
+    `App._display`. It returns False, watching nothing, when that is missing.
+    """
+    display = getattr(app, "_display", None)
+    if display is None:
+        return False
+
+    def watching(screen, renderable):
+        if renderable is not None:
+            on_frame(screen)
+        display(screen, renderable)
+
+    app._display = watching
+    return True
+
+def median_of(runs: list[dict]) -> dict:
+    """The median of every number over repeated runs of one benchmark, other values taken from the first run."""
+    return {
+        key: statistics.median(run[key] for run in runs) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+        for key, value in runs[0].items()
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """The modules slower than the baseline allows, by throughput only.
+
+    Tail latencies of single calls swing too much from run to run to fail on,
+    so p99 is reported but never compared.
+    """
+    regressions = []
+    for name, expected in baseline.get("modules", {}).items():
+        actual = results["modules"].get(name)
+        if actual is None:
+            continue
+        if actual["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {actual['ops_per_sec']:,.0f} ops/sec, baseline {expected['ops_per_sec']:,.0f}"
+            )
+    return regressions
@@ -0,0 +1,72 @@
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The most each import may cost from a cold interpreter, in milliseconds
+BUDGETS_MS = {
+    "solver": 60,
+    "solver.__main__": 70,
+    "main": 400,
+}
+
+# Modules that must not be pulled in by the import
+FORBIDDEN = {
+    "solver": ("numpy", "textual", "hashlib", "pathlib"),
+    "solver.__main__": ("numpy", "textual", "hashlib"),
+    "main": ("numpy",),
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(" ".join(sorted({{name.split(".")[0] for name in sys.modules}})))
+"""
+
+def measure(module: str, runs: int) -> tuple[float, set[str]]:
+    """The fastest of several cold imports and the top-level packages it loaded."""
+    best = float("inf")
+    loaded: set[str] = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        best = min(best, float(output[0]))
+        loaded = set(output[1].split())
+    return best, loaded
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports", description="Check the import time budgets")
+    parser.add_argument("--runs", type=int, default=5, help="the number of cold imports per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slower machines")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module, budget in BUDGETS_MS.items():
+        try:
+            elapsed, loaded = measure(module, args.runs)
+        except subprocess.CalledProcessError as error:
+            # The TUI can only be measured where Textual is installed
+            print(f"{module:<16} skipped, the import failed: {error.stderr.strip().splitlines()[-1]}")
+            continue
+
+        budget *= args.scale
+        print(f"{module:<16} {elapsed:>7.1f} ms (budget {budget:.0f} ms)")
+        if elapsed > budget:
+            failures.append(f"{module} took {elapsed:.1f} ms, the budget is {budget:.0f} ms")
+        for name in FORBIDDEN.get(module, ()):
+            if name in loaded:
+                failures.append(f"{module} imported {name}")
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
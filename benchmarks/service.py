@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from solver.service import HOST, SolverService
+
+def requests(count: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            record = {"module": "keypads", "inputs": [str(rng.randrange(100)) for _ in range(4)]}
+        elif kind == 1:
+            record = {"module": "timing", "code": f"{rng.randrange(100):02d}-{rng.choice('ABCD')}{rng.choice('ABCD')}"}
+        elif kind == 2:
+            record = {"module": "multi-buttons", "code": f"{rng.randrange(10 ** 6):06d}"}
+        else:
+            record = {"module": "hexadecimal", "code": "-".join(f"{rng.randrange(256):02X}" for _ in range(4))}
+        record["id"] = i
+        lines.append(json.dumps(record).encode() + b"\n")
+    return lines
+
+async def client(port: int, lines: list[bytes], window: int, latencies: list[float]):
+    """Send requests over one kept-alive connection with up to `window` in flight."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    sent: dict[int, float] = {}
+    in_flight = asyncio.Semaphore(window)
+
+    async def receive():
+        for _ in lines:
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            in_flight.release()
+
+    receiver = asyncio.create_task(receive())
+    for i, line in enumerate(lines):
+        await in_flight.acquire()
+        sent[json.loads(line)["id"]] = time.perf_counter()
+        writer.write(line)
+        if i % 64 == 0:
+            await writer.drain()
+    await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+async def stats(port: int) -> dict:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(b'{"command": "stats"}\n')
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return response["stats"]
+
+async def load(port: int | None, connections: int, count: int, window: int) -> dict:
+    server = None
+    if port is None:
+        # Without a port the service runs in this process on an ephemeral port
+        service = SolverService()
+        server = await asyncio.start_server(service.handle, HOST, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, requests(count, seed), window, latencies) for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    service_stats = await stats(port)
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "service": service_stats,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.service", description="Load test the local solver service")
+    parser.add_argument("--port", type=int, default=None, help="a running service to test, one is started otherwise")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20_000, help="requests per connection")
+    parser.add_argument("--window", type=int, default=256, help="requests in flight per connection")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(load(args.port, args.connections, args.requests, args.window))
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
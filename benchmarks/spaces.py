@@ -0,0 +1,33 @@
+import random
+from collections.abc import Callable
+
+from solver import keypad_engine
+from solver.tables import TABLES
+
+class Space:
+    """The inputs a module is benchmarked over, either all of them or a sample."""
+
+    def __init__(self, name: str, size: int, exhaustive: bool, generate: Callable[[], list[tuple]]):
+        self.name = name
+        self.size = size
+        self.exhaustive = exhaustive
+        self.generate = generate
+
+def _table_space(name: str) -> Space:
+    table = TABLES[name]
+    return Space(name, table.size, True, lambda: [table.decode(i) for i in range(table.size)])
+
+def _hexadecimal_inputs(count: int, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    return [("-".join(f"{rng.randrange(256):02X}" for _ in range(4)),) for _ in range(count)]
+
+def _keypads_inputs(count: int, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    return [tuple(str(rng.randrange(100)) for _ in range(4)) for _ in range(count)]
+
+def spaces(sample: int = 200_000, seed: int = 0) -> dict[str, Space]:
+    result = {name: _table_space(name) for name in TABLES}
+    # Hexadecimal (256^4) and keypads (100^4) are sampled, the keypads sweep covers the rest
+    result["hexadecimal"] = Space("hexadecimal", 256 ** 4, False, lambda: _hexadecimal_inputs(sample, seed))
+    result["keypads"] = Space("keypads", keypad_engine.SPACE_SIZE, False, lambda: _keypads_inputs(sample, seed))
+    return result
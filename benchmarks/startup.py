@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.common import watch_frames
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {"lazy": True, "eager": False}
+
+def resident() -> int:
+    """The resident set size of this process in bytes, or its peak where there is no /proc."""
+    try:
+        return int(Path("/proc/self/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+async def open_menu(lazy: bool) -> dict:
+    from textual.widgets import TabbedContent
+
+    from main import DefusalSolverApp, MainMenuScreen
+
+    app = DefusalSolverApp()
+    async with app.run_test(size=(120, 50)) as pilot:
+        await pilot.pause()
+
+        # The first frame drawn for the menu
+        drawn: float | None = None
+
+        def time_frame(screen):
+            nonlocal drawn
+            if drawn is None and isinstance(screen, MainMenuScreen):
+                drawn = time.perf_counter()
+
+        watched = watch_frames(app, time_frame)
+
+        gc.collect()
+        before = resident()
+        started = time.perf_counter()
+        screen = MainMenuScreen(lazy)
+        await app.push_screen(screen)
+        await pilot.pause()
+        while watched and drawn is None:
+            await pilot.pause()
+        first_frame = drawn - started if watched else None
+
+        gc.collect()
+        menu = resident()
+        widgets = len(screen.query("*"))
+
+        # Opening every tab once composes what a lazy menu left out
+        tabs = screen.query_one(TabbedContent)
+        opens = []
+        for name in screen.TABS:
+            opened = time.perf_counter()
+            tabs.active = f"{name}-tab"
+            await pilot.pause()
+            opens.append(time.perf_counter() - opened)
+
+        gc.collect()
+        return {
+            "first_frame_ms": first_frame * 1000 if first_frame is not None else None,
+            "menu_rss_bytes": menu - before,
+            "rss_bytes": menu,
+            "widgets": widgets,
+            "all_tabs_rss_bytes": resident() - before,
+            "all_widgets": len(screen.query("*")),
+            "first_open_ms": statistics.median(opens) * 1000,
+        }
+
+def median(values) -> float | None:
+    """The median of the values measured, None when no run could measure them."""
+    measured = [value for value in values if value is not None]
+    return statistics.median(measured) if measured else None
+
+def measure(mode: str) -> dict:
+    """Open the menu in a fresh interpreter, so every run starts from the same memory."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", mode],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Time the first frame of the menu with and without lazy tabs")
+    parser.add_argument("--runs", type=int, default=5, help="the number of fresh interpreters per mode")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-startup-results.json"), help="where to write the results")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(asyncio.run(open_menu(MODES[args.child]))))
+        return 0
+
+    runs: dict[str, list[dict]] = {mode: [] for mode in MODES}
+    for _ in range(args.runs):
+        # The modes take turns, so a slow spell of the machine hits both
+        for mode in MODES:
+            runs[mode].append(measure(mode))
+
+    results: dict = {"modes": {}}
+    for mode, samples in runs.items():
+        result = results["modes"][mode] = {key: median(sample[key] for sample in samples) for key in samples[0]}
+        first_frame = result["first_frame_ms"]
+        print(
+            f"{mode:<6} first frame {f'{first_frame:>7.1f} ms' if first_frame is not None else 'n/a':>10} "
+            f"menu {result['menu_rss_bytes'] / 2 ** 20:>6.1f} MiB ({result['rss_bytes'] / 2 ** 20:.1f} MiB resident) "
+            f"{result['widgets']:>4.0f} widgets, "
+            f"all tabs open {result['all_tabs_rss_bytes'] / 2 ** 20:>6.1f} MiB {result['all_widgets']:>4.0f} widgets, "
+            f"opening a tab {result['first_open_ms']:>6.1f} ms"
+        )
+
+    args.output.write_text(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
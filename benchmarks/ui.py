@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.common import compare, watch_frames
+from solver.stats import percentile
+
+BASELINE = Path(__file__).with_name("ui_baseline.json")
+
+SELECT_NEXT = ("enter", "down", "enter")
+
+# What an operator does on each tab: the widget to focus and the keys pressed in it
+SCRIPTS: dict[str, list[tuple[str, tuple[str, ...]]]] = {
+    "wires": [
+        ("wires-selection", ("space", "down", "space", "down", "space", "down", "space", "down", "space")),
+        ("wires-light", SELECT_NEXT),
+    ],
+    "button": [
+        ("button-color", SELECT_NEXT),
+        ("button-text", SELECT_NEXT),
+    ],
+    "hexadecimal": [
+        ("hexadecimal-enter", tuple("48656C6C")),
+    ],
+    "tiles": [
+        ("tiles-left", SELECT_NEXT),
+        ("tiles-right", ("enter", "down", "down", "enter")),
+    ],
+    "keypads": [
+        ("keypads-1", tuple("05")),
+        ("keypads-2", tuple("12")),
+        ("keypads-3", tuple("30")),
+        ("keypads-4", tuple("90")),
+    ],
+    "binary": [(f"binary-{i}", ("space",)) for i in range(1, 7 + 1)],
+    "mathematics": [
+        ("mathematics-enter", tuple("ABCD")),
+    ],
+    "color-code": [
+        *((f"color-code-color-{i}", ("enter",)) for i in range(1, 5 + 1)),
+        ("color-code-letters", tuple("RGBYW")),
+    ],
+    "multi-buttons": [
+        ("multi-buttons-code", tuple("123789")),
+    ],
+    "timing": [
+        ("timing-code", tuple("12AB")),
+    ],
+}
+
+async def run_scripts(modules: list[str], rounds: int, size: tuple[int, int]) -> dict:
+    from textual.widgets import TabbedContent
+
+    from main import DefusalSolverApp
+
+    app = DefusalSolverApp()
+    results: dict = {}
+
+    async with app.run_test(size=size) as pilot:
+        frames = 0
+
+        def count_frame(screen):
+            nonlocal frames
+            frames += 1
+
+        counted = watch_frames(app, count_frame)
+
+        await pilot.click("#continue")
+        await pilot.pause()
+        screen = app.screen
+        tabs = screen.query_one(TabbedContent)
+
+        for module in modules:
+            keystrokes: list[int] = []
+            switches: list[int] = []
+            frames_before = frames
+            render_before = screen.renderer.stats.as_dict()
+            started = time.perf_counter()
+
+            for _ in range(rounds):
+                screen.action_reset()
+                await pilot.pause()
+
+                # A lazy tab is composed the first time it is opened, which counts as a switch
+                if tabs.active != f"{module}-tab":
+                    switch_started = time.perf_counter_ns()
+                    tabs.active = f"{module}-tab"
+                    await pilot.pause()
+                    switches.append(time.perf_counter_ns() - switch_started)
+
+                for widget_id, keys in SCRIPTS[module]:
+                    widget = screen.query_one(f"#{widget_id}")
+                    widget.focus()
+                    for key in keys:
+                        # Pilot waits until the key has been handled and the screen is idle again
+                        key_started = time.perf_counter_ns()
+                        await pilot.press(key)
+                        keystrokes.append(time.perf_counter_ns() - key_started)
+
+                await pilot.pause()
+
+            elapsed = time.perf_counter() - started
+            keystrokes.sort()
+            render = {key: value - render_before[key] for key, value in screen.renderer.stats.as_dict().items()}
+            latency = screen.perf.summary().get(module, {}).get("latency", {})
+            results[module] = {
+                "keystrokes": len(keystrokes),
+                "seconds": elapsed,
+                "ops_per_sec": len(keystrokes) / elapsed,
+                "p50_ns": percentile(keystrokes, 0.50),
+                "p99_ns": percentile(keystrokes, 0.99),
+                "frames": frames - frames_before if counted else None,
+                "frames_per_round": (frames - frames_before) / rounds if counted else None,
+                "label_updates": render["updates"],
+                "repaints_avoided": render["avoided"],
+                "tab_switch_ns": sorted(switches)[len(switches) // 2] if switches else None,
+                "event_to_repaint_p50_ns": int(latency.get("p50", 0) * 1e9),
+                "answer": str(screen.query_one(f"#{module}-answer").render()),
+            }
+
+    return results
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ui", description="Benchmark the TUI headless with Pilot")
+    parser.add_argument("modules", nargs="*", help="only benchmark these tabs")
+    parser.add_argument("--rounds", type=int, default=3, help="how many times each tab's script is played")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-ui-results.json"), help="where to write the results")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="the stored results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="the allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or list(SCRIPTS)
+    results = {"modules": asyncio.run(run_scripts(modules, args.rounds, (120, 50)))}
+
+    for name, result in results["modules"].items():
+        frames = result["frames_per_round"]
+        print(
+            f"{name:<14} {result['keystrokes']:>5} keys {result['ops_per_sec']:>8,.1f} keys/sec "
+            f"p50 {result['p50_ns'] / 1e6:>7.2f} ms p99 {result['p99_ns'] / 1e6:>7.2f} ms "
+            f"{f'{frames:>6.1f}' if frames is not None else '   n/a'} frames/round {result['repaints_avoided']:>5} repaints avoided  {result['answer']}"
+        )
+
+    args.output.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Stored the baseline in {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
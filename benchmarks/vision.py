@@ -0,0 +1,65 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from solver import vision
+
+SIZES = {"720p": (720, 1280), "1080p": (1080, 1920), "1440p": (1440, 2560)}
+
+def time_call(function, *args, repeat: int) -> float:
+    """The best of `repeat` calls in milliseconds, after one warm-up call."""
+    function(*args)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def painted_frame(height: int, width: int, rng: np.random.Generator) -> np.ndarray:
+    """A noisy dark frame with the color code lines painted in, to check the reading as well."""
+    frame = rng.integers(0, 40, (height, width, 3), dtype=np.uint8)
+    for box, color in zip(vision.COLOR_CODE_BOXES, ("Red", "Green", "Blue", "Yellow", "White")):
+        rows, columns = box.slices(height, width)
+        noise = rng.integers(-12, 12, (rows.stop - rows.start, columns.stop - columns.start, 3))
+        frame[rows, columns] = np.clip(np.array(vision.COLORS[color]) + noise, 0, 255)
+    return frame
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.vision", description="Time the screenshot classifier")
+    parser.add_argument("--repeat", type=int, default=20, help="how many times each frame is classified")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-vision-results.json"), help="where to write the results")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    vision.quantize(np.zeros((1, 1, 3), dtype=np.uint8))
+    results: dict = {"table_ms": (time.perf_counter() - start) * 1000, "sizes": {}}
+    print(f"{'lookup table':<8} built in {results['table_ms']:.1f} ms")
+
+    wrong = 0
+    for name, (height, width) in SIZES.items():
+        frame = painted_frame(height, width, rng)
+        read = vision.read("color-code", frame)[0]
+        wrong += read != ("Red", "Green", "Blue", "Yellow", "White")
+        result = results["sizes"][name] = {
+            "quantize_ms": time_call(vision.quantize, frame, repeat=args.repeat),
+            "read_ms": {module: time_call(vision.read, module, frame, repeat=args.repeat) for module in vision.READERS},
+            "color_code": read,
+        }
+        print(
+            f"{name:<8} quantize {result['quantize_ms']:>6.1f} ms "
+            + " ".join(f"{module} {ms:>6.1f} ms" for module, ms in result["read_ms"].items())
+            + f" read {', '.join(map(str, read))}"
+        )
+
+    args.output.write_text(json.dumps(results, indent=2))
+    return 1 if wrong else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,2 @@
-pyinstaller --onefile --hidden-import textual.widgets._tab_pane --name=DefusalSolver main.py
\ No newline at end of file
+python -m solver tables || exit /b 1
+pyinstaller --onefile --hidden-import textual.widgets._tab_pane --add-data "solver\rules.json;solver" --add-data "solver\answers.bin;solver" --name=DefusalSolver main.py
\ No newline at end of file
@@ -1,12 +1,28 @@
+import os
+from collections.abc import Iterable
+from functools import partial
+from time import perf_counter
+
 from textual import on
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Grid, Horizontal
+from textual.message import Message
 from textual.screen import Screen
 from textual.widgets import Static, Button, TabbedContent, TabPane, SelectionList, Select, Label, MaskedInput, Switch, \
-    RadioSet, RadioButton, Footer
-import numpy as np
-import re
+    RadioSet, Footer
+
+from solver import narrowing, reload, rules, vision
+from solver.cache import AnswerCache
+from solver.session import Bomb, ModuleState, Session
+from tui import registry
+from tui.overlay import PerfOverlay
+from tui.perf import PerfMonitor
+from tui.registry import ModuleView
+from tui.render import AnswerRenderer
+from tui.scheduler import RecomputeScheduler
+from tui.screenshot import ScreenshotPrompt
+from tui.tabs import ModulePane
 
 class DefusalSolverApp(App):
     def on_mount(self) -> None:
@@ -87,739 +103,505 @@ class MainMenuScreen(Screen):
     """
 
     BINDINGS = [
-        Binding('ctrl+r', 'reset', 'Reset')
+        Binding('ctrl+r', 'reset', 'Reset'),
+        Binding('ctrl+t', 'toggle_perf', 'Performance'),
+        Binding('ctrl+n', 'new_bomb', 'New bomb'),
+        Binding('ctrl+b', 'next_bomb', 'Next bomb'),
+        Binding('ctrl+o', 'screenshot', 'Screenshot')
+    ]
+
+    MODULES = [
+        ModuleView("wires", ("wires-selection", "wires-light"), titles={
+            "wires-selection": "Which of the following wires are present",
+            "wires-light": "Select the color of the light above the wires, if any",
+        }),
+        ModuleView("button", ("button-color", "button-text"), titles={
+            "button-color": "Select the color of the button",
+            "button-text": "Select the text on the button",
+        }),
+        ModuleView("hexadecimal", ("hexadecimal-enter",), titles={
+            "hexadecimal-enter": "Enter the hexadecimal code",
+        }),
+        ModuleView("tiles", ("tiles-left", "tiles-right"), titles={
+            "tiles-left": "Select the color of the left tile",
+            "tiles-right": "Select the color of the right tile",
+        }),
+        ModuleView("keypads", ("keypads-1", "keypads-2", "keypads-3", "keypads-4"), titles={
+            "keypads-1": "Top Left",
+            "keypads-2": "Top Right",
+            "keypads-3": "Bottom Left",
+            "keypads-4": "Bottom Right",
+        }),
+        ModuleView("binary", (tuple(f"binary-{i}" for i in range(1, 7 + 1)),)),
+        ModuleView("mathematics", ("mathematics-enter",)),
+        # The line colors were never cleared by reset, only the letters are
+        ModuleView("color-code", (tuple(f"color-code-color-{i}" for i in range(1, 5 + 1)), "color-code-letters"), titles={
+            "color-code-colors": "Select the colors that appear",
+        }, keep=tuple(f"color-code-color-{i}" for i in range(1, 5 + 1))),
+        ModuleView("multi-buttons", ("multi-buttons-code",)),
+        ModuleView("timing", ("timing-code",)),
     ]
 
+    # The title of each module's tab, in the order they are shown
+    TABS = {
+        "wires": "Wires",
+        "button": "Button",
+        "hexadecimal": "Hexadecimal",
+        "tiles": "Tiles",
+        "keypads": "Keypads",
+        "binary": "Binary",
+        "mathematics": "Mathematics",
+        "color-code": "Color Code",
+        "multi-buttons": "Multi Button",
+        "timing": "Timing",
+    }
+
+    def __init__(self, lazy: bool | None = None):
+        super().__init__()
+        # A lazy screen only composes a tab the first time it is opened, DEFUSAL_TABS=eager composes them all up front
+        self.lazy = os.environ.get("DEFUSAL_TABS", "lazy") != "eager" if lazy is None else lazy
+
     def compose(self) -> ComposeResult:
         with TabbedContent():
-            with TabPane("Home"):
+            with TabPane("Home", id="home-tab"):
                 yield Static("Use the tabs above to select a module to solve", classes="tab-container")
 
-            with TabPane("Wires"):
-                # Represents the present wires
-                yield SelectionList[int](
-                    ("White", 0),
-                    ("Red", 1),
-                    ("Yellow", 2),
-                    ("Green", 3),
-                    ("Blue", 4),
-                    ("Orange", 5),
-                    id="wires-selection"
-                )
-
-                yield Static()
-
-                # Represents the active light
-                yield Select.from_values([
-                    "Red",
-                    "Yellow",
-                    "Green",
-                    "Blue",
-                    "White"
-                ], prompt="No light", id="wires-light")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="wires-answer")
-
-            with TabPane("Button"):
-                # Represents the button color
-                yield Select.from_values([
-                    "Blue",
-                    "Red",
-                    "White",
-                    "Grey",
-                ], prompt="Select the color", id="button-color")
-
-                yield Static()
-
-                # Represents the button text
-                yield Select.from_values([
-                    "Detonate",
-                    "Abort",
-                    "Blank"
-                ], prompt="Select the text", id="button-text")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="button-answer")
-
-            with TabPane("Hexadecimal"):
-                # Represents the hexadecimal text
-                yield MaskedInput(
-                    template="HH-HH-HH-HH;0",
-                    id="hexadecimal-enter",
-                )
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="hexadecimal-answer")
-
-            with TabPane("Tiles"):
-                # Represents the left tile
-                yield Select.from_values([
-                    "Red",
-                    "Green",
-                    "Blue",
-                    "Yellow",
-                    "Pink",
-                    "White"
-                ], id="tiles-left")
-
-                yield Static()
-
-                # Represents the right tile
-                yield Select.from_values([
-                    "Red",
-                    "Green",
-                    "Blue",
-                    "Yellow",
-                    "Pink",
-                    "White"
-                ], id="tiles-right")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="tiles-answer")
-
-            with TabPane("Keypads", id="keypads-tab"):
-                with Grid(id="keypads-grid"):
-                    yield MaskedInput(
-                        template="90;0",
-                        id="keypads-1",
-                        classes="keypads"
-                    )
-                    yield MaskedInput(
-                        template="90;0",
-                        id="keypads-2",
-                        classes="keypads"
-                    )
-                    yield MaskedInput(
-                        template="90;0",
-                        id="keypads-3",
-                        classes="keypads"
-                    )
-                    yield MaskedInput(
-                        template="90;0",
-                        id="keypads-4",
-                        classes="keypads"
-                    )
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="keypads-answer")
-
-            with TabPane("Binary"):
-                yield Static("Select the switches that are on")
-                yield Static()
-
-                # Represents the switches that are on
-                yield Horizontal(
-                    Switch(id="binary-1", classes="binary-switch"),
-                    Switch(id="binary-2", classes="binary-switch"),
-                    Switch(id="binary-3", classes="binary-switch"),
-                    Switch(id="binary-4", classes="binary-switch"),
-                    Switch(id="binary-5", classes="binary-switch"),
-                    Switch(id="binary-6", classes="binary-switch"),
-                    Switch(id="binary-7", classes="binary-switch")
-                )
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="binary-answer")
-
-            with TabPane("Mathematics"):
-                yield Static("Enter the letters")
-
-                yield Static()
-
-                # Represents the mathematics entry
-                yield MaskedInput(template="AA-AA;0", id="mathematics-enter")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="mathematics-answer")
-
-            with TabPane("Color Code"):
-                # Represents the color lines
-                with Horizontal(id="color-code-colors", classes="tab-container"):
-                    yield RadioSet(
-                        "Red",
-                        "Green",
-                        "Blue",
-                        "Yellow",
-                        "White",
-                        id="color-code-color-1",
-                        classes="color-code-colors"
-                    )
-                    yield RadioSet(
-                        "Red",
-                        "Green",
-                        "Blue",
-                        "Yellow",
-                        "White",
-                        id="color-code-color-2",
-                        classes="color-code-colors"
-                    )
-                    yield RadioSet(
-                        "Red",
-                        "Green",
-                        "Blue",
-                        "Yellow",
-                        "White",
-                        id="color-code-color-3",
-                        classes="color-code-colors"
-                    )
-                    yield RadioSet(
-                        "Red",
-                        "Green",
-                        "Blue",
-                        "Yellow",
-                        "White",
-                        id="color-code-color-4",
-                        classes="color-code-colors"
-                    )
-                    yield RadioSet(
-                        "Red",
-                        "Green",
-                        "Blue",
-                        "Yellow",
-                        "White",
-                        id="color-code-color-5",
-                        classes="color-code-colors"
-                    )
-
-                yield Static()
-
-                yield Static("Enter the code")
-
-                # Represents the code
-                yield MaskedInput(template="AAAAA;0", id="color-code-letters")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="color-code-answer")
-
-            with TabPane("Multi Button"):
-                yield Static("Enter the code")
-
-                # Represents the code
-                yield MaskedInput(template="999999;0", id="multi-buttons-code")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="multi-buttons-answer")
-
-            with TabPane("Timing"):
-                yield Static("Enter the code")
-
-                # Represents the code
-                yield MaskedInput(template="99-AA;0", id="timing-code")
-
-                yield Static()
-
-                # The label that shows the answer
-                yield Label("There is no solution", id="timing-answer")
+            for name, title in self.TABS.items():
+                yield ModulePane(title, getattr(self, f"compose_{name.replace('-', '_')}"), lazy=self.lazy, id=f"{name}-tab")
 
         yield Footer()
 
-    def on_mount(self) -> None:
-        self.query_one("#wires-selection").border_title = "Which of the following wires are present"
-        self.query_one("#wires-light").border_title = "Select the color of the light above the wires, if any"
+    def compose_wires(self) -> ComposeResult:
+        # Represents the present wires
+        yield SelectionList[int](
+            ("White", 0),
+            ("Red", 1),
+            ("Yellow", 2),
+            ("Green", 3),
+            ("Blue", 4),
+            ("Orange", 5),
+            id="wires-selection"
+        )
 
-        self.query_one("#button-color").border_title = "Select the color of the button"
-        self.query_one("#button-text").border_title = "Select the text on the button"
+        yield Static()
+
+        # Represents the active light
+        yield Select.from_values([
+            "Red",
+            "Yellow",
+            "Green",
+            "Blue",
+            "White"
+        ], prompt="No light", id="wires-light")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="wires-answer")
+
+    def compose_button(self) -> ComposeResult:
+        # Represents the button color
+        yield Select.from_values([
+            "Blue",
+            "Red",
+            "White",
+            "Grey",
+        ], prompt="Select the color", id="button-color")
+
+        yield Static()
+
+        # Represents the button text
+        yield Select.from_values([
+            "Detonate",
+            "Abort",
+            "Blank"
+        ], prompt="Select the text", id="button-text")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="button-answer")
+
+    def compose_hexadecimal(self) -> ComposeResult:
+        # Represents the hexadecimal text
+        yield MaskedInput(
+            template="HH-HH-HH-HH;0",
+            id="hexadecimal-enter",
+        )
 
-        self.query_one("#hexadecimal-enter").border_title = "Enter the hexadecimal code"
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="hexadecimal-answer")
+
+    def compose_tiles(self) -> ComposeResult:
+        # Represents the left tile
+        yield Select.from_values([
+            "Red",
+            "Green",
+            "Blue",
+            "Yellow",
+            "Pink",
+            "White"
+        ], id="tiles-left")
+
+        yield Static()
+
+        # Represents the right tile
+        yield Select.from_values([
+            "Red",
+            "Green",
+            "Blue",
+            "Yellow",
+            "Pink",
+            "White"
+        ], id="tiles-right")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="tiles-answer")
+
+    def compose_keypads(self) -> ComposeResult:
+        with Grid(id="keypads-grid"):
+            yield MaskedInput(
+                template="90;0",
+                id="keypads-1",
+                classes="keypads"
+            )
+            yield MaskedInput(
+                template="90;0",
+                id="keypads-2",
+                classes="keypads"
+            )
+            yield MaskedInput(
+                template="90;0",
+                id="keypads-3",
+                classes="keypads"
+            )
+            yield MaskedInput(
+                template="90;0",
+                id="keypads-4",
+                classes="keypads"
+            )
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="keypads-answer")
+
+    def compose_binary(self) -> ComposeResult:
+        yield Static("Select the switches that are on")
+        yield Static()
+
+        # Represents the switches that are on
+        yield Horizontal(
+            Switch(id="binary-1", classes="binary-switch"),
+            Switch(id="binary-2", classes="binary-switch"),
+            Switch(id="binary-3", classes="binary-switch"),
+            Switch(id="binary-4", classes="binary-switch"),
+            Switch(id="binary-5", classes="binary-switch"),
+            Switch(id="binary-6", classes="binary-switch"),
+            Switch(id="binary-7", classes="binary-switch")
+        )
 
-        self.query_one("#tiles-left").border_title = "Select the color of the left tile"
-        self.query_one("#tiles-right").border_title = "Select the color of the right tile"
+        # The label that shows the answer
+        yield Label("There is no solution", id="binary-answer")
+
+    def compose_mathematics(self) -> ComposeResult:
+        yield Static("Enter the letters")
+
+        yield Static()
+
+        # Represents the mathematics entry
+        yield MaskedInput(template="AA-AA;0", id="mathematics-enter")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="mathematics-answer")
+
+    def compose_color_code(self) -> ComposeResult:
+        # Represents the color lines
+        with Horizontal(id="color-code-colors", classes="tab-container"):
+            yield RadioSet(
+                "Red",
+                "Green",
+                "Blue",
+                "Yellow",
+                "White",
+                id="color-code-color-1",
+                classes="color-code-colors"
+            )
+            yield RadioSet(
+                "Red",
+                "Green",
+                "Blue",
+                "Yellow",
+                "White",
+                id="color-code-color-2",
+                classes="color-code-colors"
+            )
+            yield RadioSet(
+                "Red",
+                "Green",
+                "Blue",
+                "Yellow",
+                "White",
+                id="color-code-color-3",
+                classes="color-code-colors"
+            )
+            yield RadioSet(
+                "Red",
+                "Green",
+                "Blue",
+                "Yellow",
+                "White",
+                id="color-code-color-4",
+                classes="color-code-colors"
+            )
+            yield RadioSet(
+                "Red",
+                "Green",
+                "Blue",
+                "Yellow",
+                "White",
+                id="color-code-color-5",
+                classes="color-code-colors"
+            )
+
+        yield Static()
+
+        yield Static("Enter the code")
+
+        # Represents the code
+        yield MaskedInput(template="AAAAA;0", id="color-code-letters")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="color-code-answer")
+
+    def compose_multi_buttons(self) -> ComposeResult:
+        yield Static("Enter the code")
+
+        # Represents the code
+        yield MaskedInput(template="999999;0", id="multi-buttons-code")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="multi-buttons-answer")
+
+    def compose_timing(self) -> ComposeResult:
+        yield Static("Enter the code")
+
+        # Represents the code
+        yield MaskedInput(template="99-AA;0", id="timing-code")
+
+        yield Static()
+
+        # The label that shows the answer
+        yield Label("There is no solution", id="timing-answer")
 
-        self.query_one("#keypads-1").border_title = "Top Left"
-        self.query_one("#keypads-2").border_title = "Top Right"
-        self.query_one("#keypads-3").border_title = "Bottom Left"
-        self.query_one("#keypads-4").border_title = "Bottom Right"
+    def on_mount(self) -> None:
+        # Toggling an input back and forth is answered from the cache
+        self.answers = AnswerCache()
 
-        self.query_one("#color-code-colors").border_title = "Select the colors that appear"
+        # What is on screen belongs to the active bomb, the others are kept off screen
+        self.session = Session()
+        self.session.new_bomb()
 
-    @on(SelectionList.SelectedChanged)
-    def selection_list_changed(self, event: SelectionList.SelectedChanged):
-        if event.selection_list.id == "wires-selection":
-            self.calculate_wires()
+        # Every step from an input event to the repainted answer is timed for the overlay
+        self.perf = PerfMonitor()
 
-    @on(Select.Changed)
-    def select_changed(self, event: Select.Changed):
-        if event.select.id == "wires-light":
-            self.calculate_wires()
-        elif event.select.id in ["button-color", "button-text"]:
-            self.calculate_button()
-        elif event.select.id in ["tiles-left", "tiles-right"]:
-            self.calculate_tiles()
+        # Input events only mark modules dirty, they are solved once per frame
+        self.scheduler = RecomputeScheduler(
+            self.read_inputs, self.show_answer, self.call_after_refresh, on_render=self.answer_rendered
+        )
+        # The answers of a frame are written to their labels together, skipping those already shown
+        self.renderer = AnswerRenderer(self.update_answer, self.app.batch_update, self.call_next)
+
+        # Widgets are looked up once a tab is composed, events are routed by the id of the widget that changed
+        self.modules: dict[str, registry.BoundModule] = {}
+        self.modules_by_input: dict[str, str] = {}
+        self.bind_modules(view for view in self.MODULES if self.query_one(f"#{view.name}-tab", ModulePane).composed)
+
+        # The answer tables are loaded and then edits to the rule file are picked up, both off the event loop
+        self.watcher = reload.RuleWatcher(rules.RULE_FILE.path)
+        self.run_worker(self.watch_rules, thread=True, group="rules")
+
+    def bind_modules(self, views: Iterable[ModuleView]):
+        modules = registry.bind(views, self)
+        self.modules.update(modules)
+        self.modules_by_input.update(registry.index_inputs(modules.values()))
+
+        bomb = self.session.active
+        bomb.solve(self.answers)
+        for name, bound in modules.items():
+            bound.apply_titles(self)
+            self.renderer.shown[name] = str(bound.answer.render())
+            # A tab composed after the bomb was entered shows what was entered for it
+            state = bomb.states.get(name)
+            if state is not None:
+                self.show_state(name, bound, state)
+
+    @on(TabbedContent.TabActivated)
+    async def tab_activated(self, event: TabbedContent.TabActivated):
+        pane = event.pane
+        if isinstance(pane, ModulePane) and await pane.expand():
+            name = pane.id.removesuffix("-tab")
+            self.bind_modules(view for view in self.MODULES if view.name == name)
+
+    def on_unmount(self) -> None:
+        self.watcher.stop()
+
+    def watch_rules(self):
+        """Load the tables, then compile each edit of the rule file in this worker thread and hand it to the event loop."""
+        # Enumerating the tables and their prefix levels takes a moment, a table is only swapped once it is built
+        narrowing.warm()
+        while True:
+            try:
+                rule_file = self.watcher.wait()
+                if rule_file is None:
+                    return
+                prepared = reload.prepare(rule_file)
+            except (OSError, ValueError) as error:
+                self.app.call_from_thread(self.notify, str(error), title="The rules were not reloaded", severity="error")
+                continue
+            self.app.call_from_thread(self.apply_rules, prepared)
+
+    def apply_rules(self, prepared: reload.Prepared):
+        started = perf_counter()
+        reload.apply(prepared)
+        for module in prepared.modules:
+            self.answers.clear(module)
+            self.session.invalidate(module)
+        swapped = perf_counter() - started
+
+        # Only the modules whose rules changed are solved again, a tab not composed yet is solved when it is opened
+        self.scheduler.mark(*(module for module in prepared.modules if module in self.modules), force=True)
+        # Their prefix levels are built again off the event loop
+        self.run_worker(narrowing.warm, thread=True, group="tables")
+
+        for reason in prepared.skipped.values():
+            self.notify(reason, title="Restart to reload", severity="warning")
+        if prepared.modules:
+            self.notify(
+                f"{', '.join(prepared.modules)} in {prepared.seconds * 1000:.1f} ms, swapped in {swapped * 1000:.2f} ms",
+                title="Rules reloaded", timeout=4
+            )
 
+    @on(SelectionList.SelectedChanged)
+    @on(Select.Changed)
     @on(MaskedInput.Changed)
-    def masked_input_changed(self, event: MaskedInput.Changed):
-        if event.input.id == "hexadecimal-enter":
-            self.calculate_hexadecimal()
-        elif "keypads" in event.input.classes:
-            self.calculate_keypads()
-        elif event.input.id == "mathematics-enter":
-            self.calculate_mathematics()
-        elif event.input.id == "color-code-letters":
-            self.calculate_color_code()
-        elif event.input.id == "multi-buttons-code":
-            self.calculate_multi_buttons()
-        elif event.input.id == "timing-code":
-            self.calculate_timing()
-
     @on(Switch.Changed)
-    def switch_changed(self, event: Switch.Changed):
-        if "binary-switch" in event.switch.classes:
-            self.calculate_binary()
-
     @on(RadioSet.Changed)
-    def radio_set_changed(self, event: RadioSet.Changed):
-        if "color-code-colors" in event.radio_set.classes:
-            self.calculate_color_code()
-
-    """ON THE SUBJECT OF THE WIRES"""
-    def calculate_wires(self):
-        active_wires: list[str] = self.query_one("#wires-selection").selected
-        wire_count: int = len(active_wires)
-        light: str | None = self.query_one("#wires-light").selection
-
-        def update(answer: int | None = None):
-            if answer:
-                self.query_one("#wires-answer").update(f"Cut the {answer} wire")
-            else:
-                self.query_one("#wires-answer").update("There is no solution")
-
-        if wire_count == 3:
-            if "Red" not in active_wires:
-                update(1)
-            elif "White" in active_wires:
-                update(2)
-            elif "Blue" in active_wires:
-                update(3)
-        elif wire_count == 4:
-            if "Green" not in active_wires:
-                update(1)
-            elif "Blue" not in active_wires:
-                update(2)
-            elif "White" not in active_wires:
-                update(3)
-            else:
-                update(4)
-        elif wire_count == 5 and light is not None:
-            if light == "Red":
-                update(1)
-            elif light == "Green":
-                update(2)
-            elif light == "Blue":
-                update(3)
-            elif light == "Yellow":
-                update(4)
-            else:
-                update(5)
-        else:
-            update()
-
-    """ON THE SUBJECT OF THE BUTTON"""
-    def calculate_button(self):
-        button_color: str = self.query_one("#button-color").selection
-        button_text: str = self.query_one("#button-text").selection
-
-        def update(clicks: int | None = None):
-            if clicks is None:
-                self.query_one("#button-answer").update("There is no solution")
-            else:
-                if clicks <= 2:
-                    direction = "down"
-                else:
-                    direction = "up"
-                self.query_one("#button-answer").update(f"Click the button {clicks} time(s) and then click {direction}")
-
-        if button_color == "Blue" and button_text == "Detonate":
-            update(1)
-        elif button_color == "Red":
-            update(2)
-        elif button_text == "Abort":
-            update(3)
-        elif button_color == "White" or button_color == "Grey":
-            update(4)
-        else:
-            update()
-
-    """ON THE SUBJECT OF HEXADECIMAL"""
-    def calculate_hexadecimal(self):
-        raw: str = self.query_one("#hexadecimal-enter").value
-        split = raw.split("-")
-
-        def update(answer: str | None = None):
-            if answer is None:
-                self.query_one("#hexadecimal-answer").update("There is no solution")
-            else:
-                self.query_one("#hexadecimal-answer").update(f"Enter '{answer}' then submit")
-
-        try:
-            code = ''.join(chr(int(h, 16)) for h in split)
-            if len(code) != 4:
-                update()
-            else:
-                update(code)
-        except ValueError:
-            update()
-
-    """ON THE SUBJECT OF THE TILES"""
-    def calculate_tiles(self):
-        left: str = self.query_one("#tiles-left").selection
-        right: str = self.query_one("#tiles-right").selection
-
-        mapping = {
-            'Red': 1,
-            'Green': 9,
-            'Blue': 7,
-            'Yellow': 2,
-            'Pink': 6,
-            'White': 5
-        }
-
-        def update(answer: int | None = None):
-            if answer is None:
-                self.query_one("#tiles-answer").update("There is no solution")
-            else:
-                self.query_one("#tiles-answer").update(f"Enter '{answer}' then submit")
-
-        if left is None or right is None:
-            update()
+    def input_changed(self, event: Message):
+        started = perf_counter()
+        module = self.modules_by_input.get(event.control.id)
+        if module is not None:
+            self.scheduler.mark(module)
+            self.perf.since(module, "handler", started)
+
+    def read_inputs(self, module: str) -> tuple:
+        return self.modules[module].read()
+
+    def show_answer(self, module: str, inputs: tuple):
+        with self.perf.timer(module, "solve"):
+            result, text = self.answers.lookup(module, inputs)
+            if result is None:
+                # While the inputs are incomplete, show what they can still lead to
+                text = narrowing.answer(module, inputs)
+        self.renderer.show(module, text)
+        self.session.active.record(module, inputs, result, text)
+
+    def show_bomb(self, bomb: Bomb):
+        """Fill every composed tab from a bomb's stored inputs and answers, without solving them again.
+
+        The other tabs are filled from the active bomb when they are first opened.
+        """
+        bomb.solve(self.answers)
+        for name, bound in self.modules.items():
+            state = bomb.states.get(name)
+            if state is None:
+                # A bomb starts from blank inputs, even those reset keeps
+                bound.reset(keep=False)
+                self.scheduler.mark(name, force=True)
+                continue
+
+            self.show_state(name, bound, state)
+
+        self.notify(f"{bomb.name} ({len(self.session)} in total)", timeout=2)
+
+    def update_answer(self, module: str, text: str):
+        with self.perf.timer(module, "update"):
+            self.modules[module].answer.update(text)
+
+    def show_state(self, name: str, bound: registry.BoundModule, state: ModuleState):
+        # The change events this causes find the inputs already rendered and are skipped
+        bound.write(state.inputs)
+        self.renderer.show(name, state.text)
+        self.scheduler.last_inputs[name] = state.inputs
+
+    def answer_rendered(self, module: str, marked: float):
+        # The label is repainted on the next refresh
+        self.call_after_refresh(self.perf.since, module, "latency", marked)
+
+    def action_new_bomb(self):
+        self.show_bomb(self.session.new_bomb())
+
+    def action_next_bomb(self):
+        self.show_bomb(self.session.cycle())
+
+    def active_module(self) -> str | None:
+        pane = self.query_one(TabbedContent).active_pane
+        for name, bound in self.modules.items():
+            if pane is not None and pane in bound.answer.ancestors:
+                return name
+        return None
+
+    def action_screenshot(self):
+        module = self.active_module()
+        if module not in vision.READERS:
+            self.notify(f"Open the {', '.join(vision.READERS)} tab first", title="Screenshot", severity="warning")
             return
+        self.app.push_screen(ScreenshotPrompt(module), partial(self.screenshot_chosen, module))
 
-        left_value = mapping[left]
-        right_value = mapping[right]
-        update(left_value + right_value)
-
-    """ON THE SUBJECT OF THE KEYPADS"""
-    def calculate_keypads(self):
-        def update(ordered: list[str] | None = None):
-            if ordered is None:
-                self.query_one("#keypads-answer").update("There is no solution")
-            else:
-                replace_map = {
-                    'tl': "Top Left",
-                    'tr': "Top Right",
-                    'bl': "Bottom Left",
-                    'br': "Bottom Right"
-                }
-                mapped_list = [replace_map.get(val, val) for val in ordered]
-                ordered_str = str.join(", ", mapped_list)
-                self.query_one("#keypads-answer").update(f"Click the keypads in this order: {ordered_str}")
+    def screenshot_chosen(self, module: str, path: str | None):
+        if path:
+            self.run_worker(partial(self.read_screenshot, module, path), thread=True, group="screenshot")
 
+    def read_screenshot(self, module: str, path: str):
+        """Decode and classify the screenshot in this worker thread, then fill in the tab."""
         try:
-            tl: int = int(self.query_one("#keypads-1").value)
-            tr: int = int(self.query_one("#keypads-2").value)
-            bl: int = int(self.query_one("#keypads-3").value)
-            br: int = int(self.query_one("#keypads-4").value)
-        except ValueError:
-            update()
-            return
-
-        if tl < 10:
-            x = 15
-        elif tl in range(10, 20):
-            x = 20
-        elif tl in range(20, 80):
-            x = 30
-        else:
-            x = 10
-
-        if tr < 10:
-            x += 10
-        elif tr in range(10, 20):
-            x *= 2
-        elif tr in range(20, 80):
-            x *= 3
-        else:
-            x -= 10
-
-        if bl < 10:
-            x *= 2
-        elif bl in range(10, 20):
-            x *= 3
-        elif bl in range(20, 80):
-            x -= 5
-
-        if br < 10:
-            x *= 2
-        elif br in range(10, 20):
-            x += 20
-        elif br in range(20, 80):
-            x += 50
-        else:
-            x *= 3
-
-        y = (tl + tr + bl + br) / 2
-        z = x - y
-
-        if z <= 0:
-            update(["tl", "tr", "bl", "br"])
-        elif z in np.arange(0.5, 19.5):
-            update(["tl", "tr", "br", "bl"])
-        elif z in np.arange(20, 49.5):
-            update(["br", "bl", "tr", "tl"])
-        elif z in np.arange(50, 89.5):
-            update(["br", "bl", "tr", "tl"])
-        elif z >= 90:
-            update(["tr", "bl", "tl", "br"])
-
-    """ON THE SUBJECT OF BINARY"""
-    def calculate_binary(self):
-        switches = []
-        for i in range(1, 7 + 1):
-            switches.append(self.query_one(f"#binary-{i}").value)
-
-        def update(answer: int):
-            self.query_one("#binary-answer").update(f"Click the red button {answer} time(s), then submit")
-
-        if True not in switches:
-            update(1)
-        elif switches[1] == True and switches[6] == False:
-            update(2)
-        elif switches[0] == True and switches[1] == True:
-            update(3)
-        elif switches[0] == False and switches[6] == False:
-            update(4)
-        elif not False in switches[:4]:
-            update(6)
-        elif not False in switches[:3]:
-            update(5)
-        elif switches.count(False) > 3:
-            update(7)
-        elif False not in switches:
-            update(9)
-        elif switches.count(True) > 5:
-            update(8)
-        else:
-            update(10)
-
-    """ON THE SUBJECT OF MATHEMATICS"""
-    def calculate_mathematics(self):
-        raw: str = self.query_one("#mathematics-enter").value
-
-        def update(answer: int | None = None):
-            if answer is None:
-                self.query_one("#mathematics-answer").update("There is no solution")
-            else:
-                self.query_one("#mathematics-answer").update(f"Enter '{answer}' then submit")
-
-        if not re.match(r"^[A-J]{2}-[A-J]{2}$", raw):
-            update()
-            return
-
-        split = raw.split("-")
-
-        mapping = {
-            'A': '1',
-            'B': '3',
-            'C': '7',
-            'D': '2',
-            'E': '4',
-            'F': '5',
-            'G': '6',
-            'H': '0',
-            'I': '8',
-            'J': '9'
-        }
-
-        left = int(''.join(mapping.get(ch, ch) for ch in split[0]))
-        right = int(''.join(mapping.get(ch, ch) for ch in split[1]))
-        answer = left * right
-        update(answer)
-
-    """ON THE SUBJECT OF COLOR CODE"""
-    def calculate_color_code(self):
-        colors: list[str] = []
-        letters_raw: str = self.query_one("#color-code-letters").value
-
-        invalid_chars = [ch for ch in letters_raw if ch not in ['R', 'G', 'B', 'Y', 'W']]
-
-        def update(answer: str | None = None):
-            if answer is not None:
-                self.query_one("#color-code-answer").update(f"Click the red button {answer} times, then submit")
-            else:
-                self.query_one("#color-code-answer").update("There is no solution")
-
-        if invalid_chars or len(letters_raw) != 5:
-            update()
-            return
-
-        for i in range(1, 5 + 1):
-            radio_set: RadioSet = self.query_one(f"#color-code-color-{i}")
-            active: RadioButton | None = radio_set.pressed_button
-
-            if not active:
-                update()
-                return
-
-            colors.append(str(active.label))
-
-        color_mapping = {
-            'Red': 0,
-            'Green': 0,
-            'Blue': 0,
-            'Yellow': 0,
-            'White': 0
-        }
-
-        letter_mapping = {
-            'R': 1,
-            'G': 3,
-            'B': 2,
-            'Y': 3,
-            'W': 4
-        }
-
-        y = sum(list(map(lambda entry: color_mapping[entry], colors)))
-        x = sum(list(map(lambda entry: letter_mapping[entry], list(letters_raw))))
-        z = x - y
-
-        update(z)
-
-    """ON THE SUBJECT OF MULTI BUTTONS"""
-    def calculate_multi_buttons(self):
-        raw: str = self.query_one("#multi-buttons-code").value
-
-        def update(answer: list[str] | None = None):
-            if answer is None:
-                self.query_one("#multi-buttons-answer").update("There is no solution")
-            else:
-                self.query_one("#multi-buttons-answer").update(f"Click the buttons in this order: {', '.join(answer)}")
-
-        if len(raw) != 6:
-            update()
-            return
-
-        nums = list(map(lambda e: int(e), list(raw)))
-        ordered = []
-
-        if nums[0] < 6:
-            ordered.append("Red")
-        else:
-            ordered.append("Orange")
-
-        if nums[1] < 6:
-            ordered.append("Yellow")
-        else:
-            ordered.append("Green")
-
-        if nums[2] < 6:
-            ordered.append("Blue")
-        else:
-            ordered.append("Purple")
-
-        def add_remaining(order: list[int]):
-            chunked = [["Red", "Orange"], ["Yellow", "Green"], ["Blue", "Purple"]]
-            for i in order:
-                chunk = chunked[i - 1]
-                if chunk[0] in ordered:
-                    ordered.append(chunk[1])
-                else:
-                    ordered.append(chunk[0])
-
-        if nums[3] < 7:
-            add_remaining([2, 3, 1])
-        elif nums[4] < 7:
-            add_remaining([3, 2, 1])
-        elif nums[5] < 7:
-            add_remaining([1, 2, 3])
-        else:
-            add_remaining([1, 3, 2])
-
-        update(ordered)
-
-    """ON THE SUBJECT OF TIMING"""
-    def calculate_timing(self):
-        raw: str = self.query_one("#timing-code").value
-        split = raw.split("-")
-
-        def update(answer: str | None = None):
-            if answer is None:
-                self.query_one("#timing-answer").update("There is no solution")
-            else:
-                self.query_one("#timing-answer").update(f"Click the button when the color is {answer}")
-
-        if len(raw) != 5:
-            update()
+            image = vision.load_image(path)
+            started = perf_counter()
+            values = vision.read(module, image)
+            elapsed = perf_counter() - started
+        except (OSError, ValueError) as error:
+            self.app.call_from_thread(self.notify, str(error), title="The screenshot was not read", severity="error")
             return
+        self.app.call_from_thread(self.fill_inputs, module, values, elapsed)
 
-        invalid_chars = [ch for ch in split[1] if ch not in ['A', 'B', 'C', 'D']]
+    def fill_inputs(self, module: str, values: dict, elapsed: float):
+        bound = self.modules[module]
+        inputs = list(bound.read())
+        for arg, value in values.items():
+            inputs[arg] = value
+        # The change events this causes solve the module as if it was entered by hand
+        bound.write(tuple(inputs))
+        self.notify(f"Classified in {elapsed * 1000:.1f} ms, check it against the game", title=f"Read the {module}", timeout=3)
 
-        if invalid_chars:
-            update()
-            return
-
-        mapping = {
-            'A': 4,
-            'B': 3,
-            'C': 7,
-            'D': 9
-        }
-
-        left = int(split[0][0]) + int(split[0][1])
-        right = sum(list(map(lambda e: mapping[e], list(split[1]))))
-        answer = left * right
-
-        if answer in range(0, 59):
-            update("White")
-        elif answer in range(60, 99):
-            update("Red")
-        elif answer in range(100, 199):
-            update("Yellow")
-        elif answer in range(200, 299):
-            update("Green")
-        elif answer in range(300, 399):
-            update("Blue")
-        elif answer in range(400, 499):
-            update("Yellow")
-        elif answer in range(500, 599):
-            update("Red")
-        elif answer >= 600:
-            update("White")
-        else:
-            update()
+    def action_toggle_perf(self):
+        self.app.push_screen(PerfOverlay(self.perf, self.renderer.stats))
 
     def action_reset(self):
-        self.query_one("#wires-selection").deselect_all()
-        self.query_one("#wires-light").clear()
-
-        self.query_one("#button-color").clear()
-        self.query_one("#button-text").clear()
-
-        self.query_one("#hexadecimal-enter").clear()
-
-        self.query_one("#tiles-left").clear()
-        self.query_one("#tiles-right").clear()
-
-        for i in range(1, 4 + 1):
-            self.query_one(f"#keypads-{i}").clear()
-
-        for i in range(1, 7 + 1):
-            if self.query_one(f"#binary-{i}").value:
-                self.query_one(f"#binary-{i}").toggle()
-
-        self.query_one("#mathematics-enter").clear()
-
-        self.query_one("#color-code-letters").clear()
-        self.query_one("#multi-buttons-code").clear()
-        self.query_one("#timing-code").clear()
+        for bound in self.modules.values():
+            bound.reset()
 
-        for module in ["wires", "button", "hexadecimal", "tiles", "keypads", "binary", "mathematics", "color-code", "multi-buttons"]:
-            self.query_one(f"#{module}-answer").update("There is no solution")
+        # Every module is solved again from its cleared inputs
+        self.scheduler.mark(*self.modules, force=True)
 
 if __name__ == "__main__":
     app = DefusalSolverApp()
@@ -0,0 +1,13 @@
+from solver.answers import NO_SOLUTION
+from solver.batch import solve_many
+from solver.cache import AnswerCache
+from solver.modules import MODULES, Module, answer, get_module, solve
+from solver.rules import (
+    binary, button, color_code, hexadecimal, keypads, mathematics, multi_buttons, tiles, timing, wires
+)
+
+__all__ = [
+    "NO_SOLUTION", "AnswerCache", "MODULES", "Module", "answer", "get_module", "solve", "solve_many",
+    "wires", "button", "hexadecimal", "tiles", "keypads", "binary", "mathematics", "color_code",
+    "multi_buttons", "timing",
+]
@@ -0,0 +1,236 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from solver.modules import get_module
+from solver.rules import (
+    BINARY_SWITCHES, BUTTON_COLORS, BUTTON_TEXTS, COLOR_CODE_COLORS, TILE_VALUES, WIRE_COLORS, WIRE_LIGHTS
+)
+from solver.stream import solve_stream
+
+# Each module's arguments, converted to the values its widgets produce
+def _wires(args: argparse.Namespace) -> tuple:
+    return [WIRE_COLORS.index(color) for color in args.wires], args.light
+
+PARSERS = {
+    "wires": _wires,
+    "button": lambda args: (args.color, args.text),
+    "hexadecimal": lambda args: (args.code,),
+    "tiles": lambda args: (args.left, args.right),
+    "keypads": lambda args: (args.tl, args.tr, args.bl, args.br),
+    "binary": lambda args: (args.switches,),
+    "mathematics": lambda args: (args.code,),
+    "color-code": lambda args: (args.colors, args.letters),
+    "multi-buttons": lambda args: (args.code,),
+    "timing": lambda args: (args.code,),
+}
+
+def _switches(value: str) -> list[bool]:
+    if len(value) != BINARY_SWITCHES or set(value) - {"0", "1"}:
+        raise argparse.ArgumentTypeError(f"{value!r} is not {BINARY_SWITCHES} switches of 1s and 0s")
+    return [ch == "1" for ch in value]
+
+def _size(value: str) -> tuple[int, int]:
+    width, _, height = value.partition("x")
+    return int(width), int(height)
+
+def _crop(value: str) -> tuple[int, int, int, int]:
+    x, y, width, height = map(int, value.split(","))
+    return x, y, width, height
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m solver", description="Solve a Defusal module without the TUI")
+    parser.add_argument("--raw", action="store_true", help="print the raw answer as JSON instead of the instructions")
+    commands = parser.add_subparsers(dest="module", required=True, metavar="module")
+
+    wires = commands.add_parser("wires", help="the wires present and the light")
+    wires.add_argument("wires", nargs="*", choices=WIRE_COLORS, metavar="color")
+    wires.add_argument("--light", default=None, choices=WIRE_LIGHTS)
+
+    button = commands.add_parser("button", help="the button color and text")
+    button.add_argument("color", nargs="?", choices=BUTTON_COLORS)
+    button.add_argument("text", nargs="?", choices=BUTTON_TEXTS)
+
+    hexadecimal = commands.add_parser("hexadecimal", help="a code like 48-65-6C-6C")
+    hexadecimal.add_argument("code")
+
+    tiles = commands.add_parser("tiles", help="the left and right tile colors")
+    tiles.add_argument("left", choices=tuple(TILE_VALUES))
+    tiles.add_argument("right", choices=tuple(TILE_VALUES))
+
+    keypads = commands.add_parser("keypads", help="the top left, top right, bottom left and bottom right values")
+    for name in ("tl", "tr", "bl", "br"):
+        keypads.add_argument(name)
+
+    binary = commands.add_parser("binary", help="the seven switches as 1s and 0s, e.g. 1010011")
+    binary.add_argument("switches", type=_switches)
+
+    mathematics = commands.add_parser("mathematics", help="a code like AB-CD")
+    mathematics.add_argument("code")
+
+    color_code = commands.add_parser("color-code", help="the five letters and the five line colors")
+    color_code.add_argument("letters")
+    color_code.add_argument("colors", nargs=5, choices=tuple(COLOR_CODE_COLORS), metavar="color")
+
+    multi_buttons = commands.add_parser("multi-buttons", help="the six digit code")
+    multi_buttons.add_argument("code")
+
+    timing = commands.add_parser("timing", help="a code like 12-AB")
+    timing.add_argument("code")
+
+    stream = commands.add_parser("stream", help="solve a JSONL file of records, one answer line per record")
+    stream.add_argument("input", nargs="?", default="-", help="the records to solve, - for stdin")
+    stream.add_argument("-o", "--output", default="-", help="where to write the answers, - for stdout")
+
+    verify = commands.add_parser("verify", help="check the answer tables and the keypads and batch engines against the rules")
+    verify.add_argument("modules", nargs="*", help="only verify these modules")
+    verify.add_argument("--workers", type=int, default=None, help="the number of worker processes, one per core by default")
+    verify.add_argument("--shard-size", type=int, default=100_000, help="the number of inputs per shard")
+    verify.add_argument("--keypads-limit", type=int, default=10 ** 8, help="how much of the 100^4 keypads space to check")
+    verify.add_argument("--limit", type=int, default=20, help="the most diverging inputs listed per module")
+    verify.add_argument("--fuzz", type=int, default=300_000, help="how many random codes the batch engine is checked over per typed module")
+
+    serve = commands.add_parser("serve", help="answer JSON line requests on a local socket")
+    serve.add_argument("--port", type=int, default=None, help="the port to listen on, on 127.0.0.1, 7531 by default")
+    serve.add_argument("--max-batch", type=int, default=4096, help="the most requests solved in one batch")
+    serve.add_argument("--max-delay", type=float, default=0.0, help="seconds to wait for a batch to fill up")
+
+    screenshot = commands.add_parser("screenshot", help="read the colors of a module from a snip of its face")
+    screenshot.add_argument("name", choices=("wires", "tiles", "color-code"), metavar="module", help="wires, tiles or color-code")
+    screenshot.add_argument("image", type=Path, help="a PPM or .npy image, or PNG and others with Pillow installed")
+
+    frames = commands.add_parser("frames", help="follow a module's colors through a capture, printing each new answer")
+    frames.add_argument("name", choices=("wires", "tiles", "color-code"), metavar="module", help="wires, tiles or color-code")
+    frames.add_argument("source", type=Path, help="a directory of frames or a raw RGB24 video file")
+    frames.add_argument("--size", type=_size, default=None, help="the WIDTHxHEIGHT of a raw video's frames")
+    frames.add_argument("--crop", type=_crop, default=None, help="the module's face in each frame, as X,Y,WIDTH,HEIGHT")
+    frames.add_argument("--fps", type=float, default=30.0, help="the rate the capture is played at, 0 for as fast as it reads")
+    frames.add_argument("--workers", type=int, default=2, help="the number of classifier threads")
+
+    answers = commands.add_parser("tables", help="write the answer tables to the file the TUI maps at startup")
+    answers.add_argument("-o", "--output", type=Path, default=None, help="where to write the tables, next to the rule file by default")
+    answers.add_argument("--check", action="store_true", help="only check whether the file is current")
+
+    return parser
+
+# The commands import what they need when they run, so solving one module starts quickly
+def run_tables(args: argparse.Namespace) -> int:
+    from solver import tablefile
+
+    path = args.output or tablefile.answers_path()
+    if args.check:
+        try:
+            answers = tablefile.AnswerFile(path)
+            for name in answers.entries:
+                answers.table(name)
+        except (OSError, ValueError, SyntaxError) as error:
+            print(f"Stale: {error}", file=sys.stderr)
+            return 1
+        print(f"{path} is current ({', '.join(answers.entries)})")
+        return 0
+
+    path = tablefile.write(path)
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
+    return 0
+
+def run_screenshot(args: argparse.Namespace) -> int:
+    from solver import vision
+
+    try:
+        values = vision.read(args.name, vision.load_image(args.image))
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    module = get_module(args.name)
+    for arg, value in values.items():
+        print(f"{module.fields[arg]}: {value}")
+    return 0
+
+def run_frames(args: argparse.Namespace) -> int:
+    from solver import frames
+
+    fields = get_module(args.name).fields
+
+    def show(index: int, inputs: tuple, text: str):
+        read = ", ".join(f"{field} {value}" for field, value in zip(fields, inputs))
+        print(f"frame {index}: {read} -> {text}", flush=True)
+
+    try:
+        source = frames.open_frames(args.source, args.size)
+        if args.crop is not None:
+            source = frames.crop(source, args.crop)
+        stats = frames.FramePipeline(args.name, args.workers, show).run(source, args.fps)
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    print(stats.summary(), file=sys.stderr)
+    return 0
+
+def run_stream(args: argparse.Namespace) -> int:
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    try:
+        stats = solve_stream(source, output)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+def run_verify(args: argparse.Namespace) -> int:
+    from solver.verify import verify
+
+    report = verify(
+        args.modules or None,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        keypads_limit=args.keypads_limit,
+        fuzz=args.fuzz,
+        limit=args.limit
+    )
+    print(report.summary())
+    return 0 if report.ok else 1
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.module == "stream":
+        return run_stream(args)
+    if args.module == "verify":
+        return run_verify(args)
+    if args.module == "tables":
+        return run_tables(args)
+    if args.module == "screenshot":
+        return run_screenshot(args)
+    if args.module == "frames":
+        return run_frames(args)
+    if args.module == "serve":
+        from solver import service
+
+        service.run(service.DEFAULT_PORT if args.port is None else args.port, args.max_batch, args.max_delay)
+        return 0
+
+    module = get_module(args.module)
+    result = module.solve(*PARSERS[module.name](args))
+
+    if args.raw:
+        print(json.dumps(result))
+    elif result is None:
+        # An incomplete code lists the answers it can still lead to
+        from solver import narrowing, tables
+
+        tables.warm((module.name,))
+        print(narrowing.answer(module.name, PARSERS[module.name](args)))
+    else:
+        print(module.format(result))
+
+    return 0 if result is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
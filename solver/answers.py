@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+
+from solver.rules import KEYPAD_NAMES
+
+NO_SOLUTION = "There is no solution"
+
+def wires(answer: int | None) -> str:
+    if answer:
+        return f"Cut the {answer} wire"
+    return NO_SOLUTION
+
+def button(clicks: int | None) -> str:
+    if clicks is None:
+        return NO_SOLUTION
+
+    if clicks <= 2:
+        direction = "down"
+    else:
+        direction = "up"
+    return f"Click the button {clicks} time(s) and then click {direction}"
+
+def hexadecimal(answer: str | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Enter '{answer}' then submit"
+
+def tiles(answer: int | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Enter '{answer}' then submit"
+
+def keypads(ordered: Sequence[str] | None) -> str:
+    if ordered is None:
+        return NO_SOLUTION
+    ordered_str = ", ".join(KEYPAD_NAMES[val] for val in ordered)
+    return f"Click the keypads in this order: {ordered_str}"
+
+def binary(answer: int | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Click the red button {answer} time(s), then submit"
+
+def mathematics(answer: int | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Enter '{answer}' then submit"
+
+def color_code(answer: int | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Click the red button {answer} times, then submit"
+
+def multi_buttons(answer: Sequence[str] | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Click the buttons in this order: {', '.join(answer)}"
+
+def timing(answer: str | None) -> str:
+    if answer is None:
+        return NO_SOLUTION
+    return f"Click the button when the color is {answer}"
@@ -0,0 +1,12 @@
+"""NumPy for the bulk paths, imported the first time one of them runs."""
+from functools import cache
+
+# Below this many records NumPy costs more than it saves
+BATCH_THRESHOLD = 64
+
+@cache
+def numpy():
+    # The scalar paths never need NumPy, so importing the solver does not pull it in
+    import numpy as np
+
+    return np
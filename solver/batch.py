@@ -0,0 +1,44 @@
+from collections.abc import Callable, Iterable, Mapping
+from functools import partial
+from typing import Any
+
+from solver import code_engine, keypad_engine
+from solver.modules import get_module
+
+# Modules that solve a whole batch at once rather than record by record
+BATCH_SOLVERS: dict[str, Callable[[list[tuple]], list[Any]]] = {
+    "keypads": keypad_engine.solve_batch,
+    **{name: partial(code_engine.solve_records, name) for name in code_engine.ENGINES},
+}
+
+def solve_many(module: str, inputs: Iterable[Mapping[str, Any] | tuple], formatted: bool = False) -> list[Any]:
+    """Solve every input record for one module.
+
+    A record is either a tuple of the solver's positional arguments or a mapping
+    keyed by the module's field names. With `formatted` the answer text shown in
+    the TUI is returned instead of the raw result.
+    """
+    descriptor = get_module(module)
+    solve = descriptor.solve
+    fields = descriptor.fields
+    batch_solver = BATCH_SOLVERS.get(module)
+
+    if batch_solver is not None:
+        results = batch_solver([
+            tuple(record[field] for field in fields) if isinstance(record, Mapping) else tuple(record)
+            for record in inputs
+        ])
+    else:
+        results = []
+        append = results.append
+
+        for record in inputs:
+            if isinstance(record, Mapping):
+                append(solve(*[record[field] for field in fields]))
+            else:
+                append(solve(*record))
+
+    if formatted:
+        return [descriptor.format(result) for result in results]
+
+    return results
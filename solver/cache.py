@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from solver.modules import get_module
+
+def normalize(inputs: Any) -> Hashable:
+    """Turn solver arguments into a hashable key, lists becoming tuples."""
+    if isinstance(inputs, (list, tuple)):
+        return tuple(normalize(value) for value in inputs)
+    return inputs
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry."""
+
+    __slots__ = ("maxsize", "entries", "hits", "misses", "evictions")
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("A cache needs room for at least one entry")
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entries = self.entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+_MISSING = object()
+
+class AnswerCache:
+    """Remembers the raw answer and the answer text of each module's recent inputs.
+
+    Every module has its own LRU, so the big keypads space cannot push out the
+    answers of the small modules. `sizes` overrides `maxsize` per module.
+    """
+
+    def __init__(self, maxsize: int = 1024, sizes: dict[str, int] | None = None):
+        self.maxsize = maxsize
+        self.sizes = sizes or {}
+        self.caches: dict[str, LRUCache] = {}
+
+    def _cache(self, module: str) -> LRUCache:
+        cache = self.caches.get(module)
+        if cache is None:
+            cache = self.caches[module] = LRUCache(self.sizes.get(module, self.maxsize))
+        return cache
+
+    def lookup(self, module: str, inputs: tuple) -> tuple[Any, str]:
+        cache = self._cache(module)
+        key = normalize(inputs)
+        entry = cache.get(key, _MISSING)
+        if entry is _MISSING:
+            descriptor = get_module(module)
+            result = descriptor.solve(*inputs)
+            entry = (result, descriptor.format(result))
+            cache.put(key, entry)
+        return entry
+
+    def solve(self, module: str, inputs: tuple) -> Any:
+        return self.lookup(module, inputs)[0]
+
+    def answer(self, module: str, inputs: tuple) -> str:
+        return self.lookup(module, inputs)[1]
+
+    def clear(self, module: str | None = None):
+        if module is None:
+            for cache in self.caches.values():
+                cache.clear()
+        elif module in self.caches:
+            self.caches[module].clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {module: cache.stats() for module, cache in self.caches.items()}
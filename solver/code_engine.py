@@ -0,0 +1,284 @@
+"""Vectorized solvers for whole arrays of typed codes."""
+from collections.abc import Callable, Sequence
+from functools import cache
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from solver import rules
+from solver.arrays import BATCH_THRESHOLD, numpy
+from solver.modules import get_module
+
+if TYPE_CHECKING:
+    import numpy as np
+
+"""ON THE SUBJECT OF BATCHES OF CODES
+
+The typed modules are solved for a whole array of codes at once. Codes are
+fixed width byte strings, an array of dtype S or a 2-D uint8 array with a row
+per code, trailing NUL bytes being padding as NumPy's S strings have them.
+Every byte is mapped through a 256 entry translation table per position, so a
+batch is a handful of vectorized operations whatever its size.
+
+The answers always match the rule given the code decoded as Latin-1, including
+its odd cases such as "123-A" for timing. Hexadecimal codes that are not in the
+HH-HH-HH-HH form but could still be valid are the only ones handed to the rule.
+"""
+# The width of each module's codes as the TUI masks them
+WIDTHS = {"hexadecimal": 11, "mathematics": 5, "color-code": 5, "multi-buttons": 6, "timing": 5}
+
+DASH = ord("-")
+
+class CodeBatch(NamedTuple):
+    # The answer of every code, or its index into `palette` when there is one
+    values: "np.ndarray"
+    # False where the rule gives no answer
+    valid: "np.ndarray"
+    palette: tuple | None = None
+
+    def answers(self) -> list[Any]:
+        """The answers as the rule returns them, None for the invalid codes."""
+        np = numpy()
+        if self.palette is not None:
+            # The last entry stands for the invalid codes
+            table = np.empty(len(self.palette) + 1, dtype=object)
+            for i, answer in enumerate(self.palette):
+                table[i] = answer
+            return table[np.where(self.valid, self.values, len(self.palette))].tolist()
+
+        if self.values.ndim == 2:
+            # The four code points of each hexadecimal answer, read as one string per row
+            answers = np.ascontiguousarray(self.values, dtype="<u4").view("<U4").ravel().astype(object)
+            for i in (self.values[:, -1] == 0).nonzero()[0].tolist():
+                # NumPy drops trailing NULs from strings
+                answers[i] = "".join(map(chr, self.values[i].tolist()))
+        else:
+            answers = self.values.astype(object)
+        answers[~self.valid] = None
+        return answers.tolist()
+
+def as_bytes(codes, width: int) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """The first `width` bytes of every code, whether the rest is padding, and every byte."""
+    np = numpy()
+    array = np.asarray(codes)
+    if array.dtype.kind == "S" and array.dtype.itemsize:
+        array = np.ascontiguousarray(array.reshape(-1))
+        full = array.view(np.uint8).reshape(len(array), array.dtype.itemsize)
+    elif array.dtype == np.uint8 and array.ndim == 2:
+        full = array
+    else:
+        raise ValueError(f"Expected an array of byte strings or a 2-D uint8 array, got {array.dtype} {array.shape}")
+
+    if full.shape[1] >= width:
+        fits = ~full[:, width:].any(axis=1)
+        return full[:, :width], fits, full
+
+    padded = np.zeros((len(full), width), dtype=np.uint8)
+    padded[:, :full.shape[1]] = full
+    return padded, np.ones(len(full), dtype=bool), full
+
+def _table(mapping: dict[str, Any], convert: Callable[[Any], Any] = int) -> tuple["np.ndarray", "np.ndarray"]:
+    """A value and a validity table over every byte, for a mapping keyed by characters."""
+    np = numpy()
+    values = np.zeros(256, dtype=np.int64)
+    valid = np.zeros(256, dtype=bool)
+    for key, value in mapping.items():
+        # NUL is padding, and longer or wider keys never match one byte
+        if len(key) == 1 and 0 < ord(key) < 256:
+            values[ord(key)] = convert(value)
+            valid[ord(key)] = True
+    return values, valid
+
+@cache
+def _tables(raw: bytes) -> dict[str, Any]:
+    """The translation tables of the current rules, built again when the rules are reloaded."""
+    np = numpy()
+    digits = {str(i): i for i in range(10)}
+    hexadecimal = {**digits, **{ch: int(ch, 16) for ch in "abcdefABCDEF"}}
+
+    # A mathematics letter stands for a string of digits, concatenating two multiplies the first
+    math_values, math_valid = _table(rules.MATHEMATICS_DIGITS)
+    math_scale, _ = _table(rules.MATHEMATICS_DIGITS, lambda value: 10 ** len(value))
+
+    # The answers of multi buttons only depend on the first three digits being below 6 and the order picked
+    multi_palette = []
+    for pairs in range(8):
+        for order in range(4):
+            first = "".join("0" if pairs >> i & 1 else "9" for i in range(3))
+            multi_palette.append(rules.multi_buttons(first + "9" * order + "0" * (3 - order)))
+
+    return {
+        "digits": _table(digits),
+        "hexadecimal": _table(hexadecimal),
+        "mathematics": (math_values, math_valid, math_scale),
+        "color-code": _table(rules.COLOR_CODE_LETTERS),
+        "color-code weights": np.array(list(rules.COLOR_CODE_COLORS.values()), dtype=np.int64),
+        "multi-buttons": tuple(multi_palette),
+        "timing": _table(rules.TIMING_VALUES),
+    }
+
+def _current() -> dict[str, Any]:
+    # Keyed on the file's bytes, whose hash Python keeps, so a batch does not hash the file again
+    return _tables(rules.RULE_FILE.raw)
+
+"""ON THE SUBJECT OF THE MODULES"""
+def hexadecimal(codes) -> CodeBatch:
+    np = numpy()
+    matrix, fits, full = as_bytes(codes, WIDTHS["hexadecimal"])
+    values, valid = _current()["hexadecimal"]
+
+    nibbles = matrix[:, [0, 1, 3, 4, 6, 7, 9, 10]]
+    canonical = fits & valid[nibbles].all(axis=1) & (matrix[:, [2, 5, 8]] == DASH).all(axis=1)
+    nibble_values = values[nibbles]
+    answers = (nibble_values[:, 0::2] * 16 + nibble_values[:, 1::2]).astype(np.uint32)
+
+    # Four parts is all the rule needs, int() takes "0x41", " 41" or "4_1" as well
+    loose = ~canonical & ((full == DASH).sum(axis=1) == 3)
+    for i in loose.nonzero()[0].tolist():
+        answer = rules.hexadecimal(full[i].tobytes().rstrip(b"\0").decode("latin-1"))
+        if answer is not None:
+            answers[i] = [ord(ch) for ch in answer]
+            canonical[i] = True
+    return CodeBatch(answers, canonical)
+
+def mathematics(codes) -> CodeBatch:
+    matrix, fits, _ = as_bytes(codes, WIDTHS["mathematics"])
+    values, valid, scale = _current()["mathematics"]
+
+    letters = matrix[:, [0, 1, 3, 4]]
+    ok = fits & valid[letters].all(axis=1) & (matrix[:, 2] == DASH)
+    left = values[letters[:, 0]] * scale[letters[:, 1]] + values[letters[:, 1]]
+    right = values[letters[:, 2]] * scale[letters[:, 3]] + values[letters[:, 3]]
+    return CodeBatch(left * right, ok)
+
+def color_code(codes, colors) -> CodeBatch:
+    """`colors` holds the index of each line's color in rules.COLOR_CODE_COLORS, -1 when it is not picked."""
+    np = numpy()
+    matrix, fits, _ = as_bytes(codes, WIDTHS["color-code"])
+    tables = _current()
+    values, valid = tables["color-code"]
+    weights = tables["color-code weights"]
+
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.int64), (len(matrix), 5))
+    picked = ((colors >= 0) & (colors < len(weights))).all(axis=1)
+    y = weights[np.where(colors >= 0, colors, 0) % len(weights)].sum(axis=1)
+    ok = fits & valid[matrix].all(axis=1) & picked
+    return CodeBatch(values[matrix].sum(axis=1) - y, ok)
+
+def multi_buttons(codes) -> CodeBatch:
+    np = numpy()
+    matrix, fits, _ = as_bytes(codes, WIDTHS["multi-buttons"])
+    values, valid = _current()["digits"]
+
+    digits = values[matrix]
+    ok = fits & valid[matrix].all(axis=1)
+    pairs = (digits[:, :3] < 6) @ np.array([1, 2, 4])
+    # The first of the last three digits below 7 picks the order, the fourth order when none is
+    low = digits[:, 3:] < 7
+    order = np.where(low.any(axis=1), low.argmax(axis=1), 3)
+    return CodeBatch(pairs * 4 + order, ok, _current()["multi-buttons"])
+
+def timing(codes) -> CodeBatch:
+    np = numpy()
+    matrix, fits, _ = as_bytes(codes, WIDTHS["timing"])
+    digits, digit_valid = _current()["digits"]
+    values, valid = _current()["timing"]
+
+    # The rule splits on the one dash, takes the first two characters as digits and sums the letters after the dash
+    dashes = matrix == DASH
+    dash = dashes.argmax(axis=1)
+    after = np.arange(matrix.shape[1]) > dash[:, None]
+    ok = (
+        fits & (dashes.sum(axis=1) == 1) & (dash >= 2)
+        & digit_valid[matrix[:, 0]] & digit_valid[matrix[:, 1]]
+        & (valid[matrix] | ~after).all(axis=1)
+    )
+    left = digits[matrix[:, 0]] + digits[matrix[:, 1]]
+    right = np.where(after, values[matrix], 0).sum(axis=1)
+    return CodeBatch(rules.TIMING_COLORS.index_many(left * right), ok, rules.TIMING_COLORS.values)
+
+ENGINES: dict[str, Callable[..., CodeBatch]] = {
+    "hexadecimal": hexadecimal,
+    "mathematics": mathematics,
+    "color-code": color_code,
+    "multi-buttons": multi_buttons,
+    "timing": timing,
+}
+
+"""ON THE SUBJECT OF RECORDS"""
+def _encodable(code: Any, width: int) -> bool:
+    return type(code) is str and len(code) <= width and code.isascii() and "\0" not in code
+
+def _color_rows() -> Callable[[Any], list[int] | None]:
+    indexes = {color: i for i, color in enumerate(rules.COLOR_CODE_COLORS)}
+    indexes[None] = -1
+    rows: dict[tuple, list[int] | None] = {}
+
+    # A bomb's lines rarely change between records, so each set of lines is converted once
+    def row(colors: Any) -> list[int] | None:
+        key = tuple(colors) if isinstance(colors, (tuple, list)) else None
+        if key not in rows:
+            valid = key is not None and len(key) == 5 and all(color in indexes for color in key)
+            rows[key] = [indexes[color] for color in key] if valid else None
+        return rows[key]
+
+    return row
+
+def _solve_codes(name: str, records: Sequence[tuple]) -> list[Any] | None:
+    """Solve records that are all one ASCII code in one batch, None when some are not."""
+    np = numpy()
+    width = WIDTHS[name]
+    if set(map(len, records)) != {1}:
+        return None
+    codes = [record[0] for record in records]
+    try:
+        joined = "".join(codes)
+    except TypeError:
+        return None
+    # NumPy would drop a trailing NUL the rule sees
+    if "\0" in joined or not joined.isascii():
+        return None
+
+    # One byte more than the width finds the codes that are too long
+    array = np.array(codes, dtype=f"S{width + 1}")
+    results = ENGINES[name](array).answers()
+    for i in array.view(np.uint8).reshape(len(array), width + 1)[:, width].nonzero()[0].tolist():
+        results[i] = get_module(name).solve(*records[i])
+    return results
+
+def solve_records(name: str, records: Sequence[tuple]) -> list[Any]:
+    """Solve records of a typed module's arguments, handing those that are no ASCII code to the rule."""
+    solve = get_module(name).solve
+    if len(records) < BATCH_THRESHOLD:
+        return [solve(*record) for record in records]
+
+    if name != "color-code":
+        results = _solve_codes(name, records)
+        if results is not None:
+            return results
+
+    np = numpy()
+    width = WIDTHS[name]
+    code_arg = 1 if name == "color-code" else 0
+    color_row = _color_rows() if name == "color-code" else None
+
+    results = [None] * len(records)
+    batched = []
+    codes = []
+    colors = []
+    for i, record in enumerate(records):
+        row = None
+        if len(record) == code_arg + 1 and _encodable(record[code_arg], width):
+            row = color_row(record[0]) if color_row is not None else True
+        if row is None:
+            results[i] = solve(*record)
+            continue
+        batched.append(i)
+        codes.append(record[code_arg])
+        if color_row is not None:
+            colors.append(row)
+
+    if batched:
+        array = np.array(codes, dtype=f"S{width}")
+        batch = ENGINES[name](array, colors) if color_row is not None else ENGINES[name](array)
+        for i, answer in zip(batched, batch.answers()):
+            results[i] = answer
+    return results
@@ -0,0 +1,251 @@
+"""Packing the inputs of a module into a single integer and back."""
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from solver import rules
+
+"""ON THE SUBJECT OF FIELDS"""
+class Choice:
+    """One value out of a fixed list, such as a select or a radio set. None is the blank state."""
+
+    __slots__ = ("values", "index", "size")
+
+    def __init__(self, values: Sequence[Any]):
+        self.values = (None, *values)
+        self.index = {value: i for i, value in enumerate(self.values)}
+        self.size = len(self.values)
+
+    def encode(self, value: Any) -> int:
+        try:
+            return self.index[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not one of {self.values}") from None
+
+    def decode(self, index: int) -> Any:
+        return self.values[index]
+
+class Flags:
+    """The selected values of a selection list of 0 to count - 1, as a sorted tuple."""
+
+    __slots__ = ("count", "size")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.size = 1 << count
+
+    def encode(self, selected: Sequence[int]) -> int:
+        mask = 0
+        for i in selected:
+            if type(i) is not int or not 0 <= i < self.count or mask >> i & 1:
+                raise ValueError(f"{tuple(selected)!r} is not a selection of 0 to {self.count - 1}")
+            mask |= 1 << i
+        return mask
+
+    def decode(self, mask: int) -> tuple[int, ...]:
+        return tuple(i for i in range(self.count) if mask >> i & 1)
+
+class Switches:
+    """A row of switches, the first one being the lowest bit."""
+
+    __slots__ = ("count", "size")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.size = 1 << count
+
+    def encode(self, switches: Sequence[bool]) -> int:
+        if len(switches) != self.count:
+            raise ValueError(f"Expected {self.count} switches, got {len(switches)}")
+        mask = 0
+        for i, value in enumerate(switches):
+            if value is True:
+                mask |= 1 << i
+            elif value is not False:
+                raise ValueError(f"Switch {i + 1} is {value!r}, not True or False")
+        return mask
+
+    def decode(self, mask: int) -> tuple[bool, ...]:
+        return tuple(bool(mask >> i & 1) for i in range(self.count))
+
+# The characters each MaskedInput template character accepts
+MASK_ALPHABETS = {
+    "A": "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+    "H": "0123456789ABCDEFabcdef",
+    "9": "0123456789",
+    "0": "0123456789",
+}
+
+class Masked:
+    """The value of a MaskedInput typed from the left, from empty up to the whole template.
+
+    A value shows the separators up to the next character to type, the way the
+    widget does, so "48-65-" is four characters in. Values with gaps in them are
+    outside the space.
+    """
+
+    __slots__ = ("template", "slots", "alphabets", "indexes", "offsets", "size")
+
+    def __init__(self, template: str):
+        self.template = template
+        # Where each typed character goes in the value
+        self.slots = [i for i, ch in enumerate(template) if ch in MASK_ALPHABETS]
+        self.alphabets = [MASK_ALPHABETS[template[i]] for i in self.slots]
+        self.indexes = [{ch: i for i, ch in enumerate(alphabet)} for alphabet in self.alphabets]
+
+        # Values with fewer characters come first, offsets[n] counts the values shorter than n
+        self.offsets = [0]
+        count = 1
+        for alphabet in self.alphabets:
+            self.offsets.append(self.offsets[-1] + count)
+            count *= len(alphabet)
+        self.size = self.offsets[-1] + count
+
+    def show(self, typed: str) -> str:
+        if not typed:
+            return ""
+        end = self.slots[len(typed)] if len(typed) < len(self.slots) else len(self.template)
+        value = list(self.template[:end])
+        for slot, ch in zip(self.slots, typed):
+            value[slot] = ch
+        return "".join(value)
+
+    def encode(self, value: str) -> int:
+        if not isinstance(value, str):
+            raise ValueError(f"{value!r} is not text")
+        typed = "".join(value[slot] for slot in self.slots if slot < len(value))
+        if self.show(typed) != value:
+            raise ValueError(f"{value!r} does not fit the template {self.template!r}")
+
+        index = 0
+        for ch, alphabet, letters in zip(typed, self.alphabets, self.indexes):
+            letter = letters.get(ch)
+            if letter is None:
+                raise ValueError(f"{value!r} does not fit the template {self.template!r}")
+            index = index * len(alphabet) + letter
+        return self.offsets[len(typed)] + index
+
+    def decode(self, index: int) -> str:
+        length = len(self.offsets) - 1
+        while self.offsets[length] > index:
+            length -= 1
+        index -= self.offsets[length]
+
+        typed = []
+        for alphabet in reversed(self.alphabets[:length]):
+            index, letter = divmod(index, len(alphabet))
+            typed.append(alphabet[letter])
+        return self.show("".join(reversed(typed)))
+
+class Group:
+    """Several fields packed together, in the shape of a tuple."""
+
+    __slots__ = ("fields", "size")
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.size = 1
+        for field in fields:
+            self.size *= field.size
+
+    def encode(self, values: Sequence[Any]) -> int:
+        if len(values) != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} values, got {len(values)}")
+        index = 0
+        for field, value in zip(self.fields, values):
+            index = index * field.size + field.encode(value)
+        return index
+
+    def decode(self, index: int) -> tuple:
+        values = []
+        for field in reversed(self.fields):
+            index, part = divmod(index, field.size)
+            values.append(field.decode(part))
+        return tuple(reversed(values))
+
+"""ON THE SUBJECT OF MODULES"""
+# The inputs of each module in the shape the main menu screen reads them, the templates are the ones in main.py
+FIELDS: dict[str, Group] = {
+    "wires": Group(Flags(len(rules.WIRE_COLORS)), Choice(rules.WIRE_LIGHTS)),
+    "button": Group(Choice(rules.BUTTON_COLORS), Choice(rules.BUTTON_TEXTS)),
+    "hexadecimal": Group(Masked("HH-HH-HH-HH")),
+    "tiles": Group(Choice(tuple(rules.TILE_VALUES)), Choice(tuple(rules.TILE_VALUES))),
+    "keypads": Group(*(Masked("90") for _ in range(4))),
+    "binary": Group(Switches(rules.BINARY_SWITCHES)),
+    "mathematics": Group(Masked("AA-AA")),
+    "color-code": Group(Group(*(Choice(tuple(rules.COLOR_CODE_COLORS)) for _ in range(5))), Masked("AAAAA")),
+    "multi-buttons": Group(Masked("999999")),
+    "timing": Group(Masked("99-AA")),
+}
+
+class Slot:
+    """Where a module sits in a packed state."""
+
+    __slots__ = ("name", "field", "shift", "mask")
+
+    def __init__(self, name: str, field: Group, shift: int):
+        self.name = name
+        self.field = field
+        self.shift = shift
+        self.mask = (1 << (field.size - 1).bit_length()) - 1
+
+# Every module gets whole bits of its own, so one module is read back with a shift and a mask
+LAYOUT: list[Slot] = []
+STATE_BITS = 0
+for name, field in FIELDS.items():
+    LAYOUT.append(Slot(name, field, STATE_BITS))
+    STATE_BITS += (field.size - 1).bit_length()
+del name, field
+
+STATE_BYTES = (STATE_BITS + 7) // 8
+
+def _field(name: str) -> Group:
+    try:
+        return FIELDS[name]
+    except KeyError:
+        raise ValueError(f"There is no module called '{name}'") from None
+
+def encode_module(name: str, inputs: Sequence[Any]) -> int:
+    return _field(name).encode(inputs)
+
+def decode_module(name: str, index: int) -> tuple:
+    field = _field(name)
+    if not 0 <= index < field.size:
+        raise ValueError(f"{index} is outside the {field.size} states of {name}")
+    return field.decode(index)
+
+def encode_state(states: Mapping[str, Sequence[Any]]) -> int:
+    """Pack the inputs of every module into one integer of STATE_BITS bits.
+
+    Modules that are left out are packed as blank, the state a reset leaves them in.
+    """
+    code = 0
+    for slot in LAYOUT:
+        inputs = states.get(slot.name)
+        if inputs is not None:
+            code |= slot.field.encode(inputs) << slot.shift
+    unknown = states.keys() - FIELDS.keys()
+    if unknown:
+        raise ValueError(f"There is no module called '{min(unknown)}'")
+    return code
+
+def decode_state(code: int) -> dict[str, tuple]:
+    """Unpack a state from `encode_state`, leaving out the modules that are blank."""
+    if not 0 <= code < 1 << STATE_BITS:
+        raise ValueError(f"A state has {STATE_BITS} bits")
+
+    states = {}
+    for slot in LAYOUT:
+        index = code >> slot.shift & slot.mask
+        if index:
+            if index >= slot.field.size:
+                raise ValueError(f"{index} is outside the {slot.field.size} states of {slot.name}")
+            states[slot.name] = slot.field.decode(index)
+    return states
+
+def pack(states: Mapping[str, Sequence[Any]]) -> bytes:
+    return encode_state(states).to_bytes(STATE_BYTES, "big")
+
+def unpack(data: bytes) -> dict[str, tuple]:
+    if len(data) != STATE_BYTES:
+        raise ValueError(f"A packed state is {STATE_BYTES} bytes, got {len(data)}")
+    return decode_state(int.from_bytes(data, "big"))
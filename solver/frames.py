@@ -0,0 +1,206 @@
+"""Classifying a stream of video frames, dropping the ones it cannot keep up with."""
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Condition, Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from solver import codec, narrowing, tables, vision
+from solver.arrays import numpy
+from solver.modules import get_module
+from solver.stats import percentile
+
+if TYPE_CHECKING:
+    import numpy as np
+
+"""ON THE SUBJECT OF FRAME STREAMS
+
+Frames are read as views: a raw video file is mapped and each frame is a slice
+of the mapping, and a cropped frame is a slice of that. Nothing is copied
+before the classifier quantizes it.
+
+The reader keeps only the newest frame waiting. A worker that frees up takes
+it and every frame read meanwhile is dropped, so when classifying falls behind
+the answers skip ahead instead of lagging further and further behind. A frame
+that finishes after a newer one is dropped too.
+"""
+STAGES = ("read", "classify", "solve")
+
+# Files a frame directory is read from, in name order
+FRAME_SUFFIXES = (".ppm", ".pnm", ".npy", ".png", ".bmp", ".jpg", ".jpeg")
+
+class Frame(NamedTuple):
+    index: int
+    pixels: "np.ndarray"
+    # When the frame was read, the lag of every stage counts from there
+    read: float
+
+class StageStats:
+    __slots__ = ("frames", "first", "last", "lags")
+
+    def __init__(self, window: int):
+        self.frames = 0
+        self.first: float | None = None
+        self.last: float | None = None
+        # The most recent lags from reading the frame to the end of the stage, in seconds
+        self.lags: deque[float] = deque(maxlen=window)
+
+    def add(self, frame: Frame, now: float):
+        if self.first is None:
+            self.first = frame.read
+        self.frames += 1
+        self.last = now
+        self.lags.append(now - frame.read)
+
+    @property
+    def fps(self) -> float:
+        if self.first is None or self.last is None or self.last <= self.first:
+            return 0.0
+        return self.frames / (self.last - self.first)
+
+    def percentile(self, fraction: float) -> float:
+        return percentile(sorted(self.lags), fraction, 0.0) * 1000
+
+class FrameStats:
+    def __init__(self, window: int = 10_000):
+        self.stages = {stage: StageStats(window) for stage in STAGES}
+        # Frames that were never classified, and classified frames that a newer one overtook
+        self.dropped = 0
+        self.overtaken = 0
+        self.changes = 0
+
+    def summary(self) -> str:
+        read = self.stages["read"].frames
+        lines = [f"{read:,} frames, {self.dropped:,} dropped, {self.overtaken:,} overtaken, {self.changes:,} answer changes"]
+        for stage, stats in self.stages.items():
+            lines.append(
+                f"  {stage:<9} {stats.frames:>8,} frames {stats.fps:>8.1f} fps "
+                f"lag p50 {stats.percentile(0.50):>7.1f} ms p99 {stats.percentile(0.99):>7.1f} ms"
+            )
+        return "\n".join(lines)
+
+"""ON THE SUBJECT OF SOURCES"""
+def raw_video(path: Path, width: int, height: int) -> Iterator["np.ndarray"]:
+    """The frames of a headerless RGB24 file, such as `ffmpeg -f rawvideo -pix_fmt rgb24` writes."""
+    np = numpy()
+    size = Path(path).stat().st_size
+    if size < width * height * 3:
+        raise ValueError(f"{path} holds less than one {width}x{height} frame")
+    video = np.memmap(path, dtype=np.uint8, mode="r", shape=(size // (width * height * 3), height, width, 3))
+    for i in range(len(video)):
+        yield video[i]
+
+def frame_directory(path: Path) -> Iterator["np.ndarray"]:
+    files = sorted(file for file in Path(path).iterdir() if file.suffix.lower() in FRAME_SUFFIXES)
+    if not files:
+        raise ValueError(f"{path} holds no {', '.join(FRAME_SUFFIXES)} frames")
+    for file in files:
+        yield vision.load_image(file)
+
+def open_frames(path: Path, size: tuple[int, int] | None = None) -> Iterator["np.ndarray"]:
+    """A directory of images, or a raw video file of the given (width, height)."""
+    if Path(path).is_dir():
+        return frame_directory(path)
+    if size is None:
+        raise ValueError(f"The frame size of {path} is needed, for example --size 1920x1080")
+    return raw_video(path, *size)
+
+def crop(frames: Iterable["np.ndarray"], box: tuple[int, int, int, int]) -> Iterator["np.ndarray"]:
+    """The (x, y, width, height) part of every frame, as views."""
+    x, y, width, height = box
+    for pixels in frames:
+        view = pixels[y:y + height, x:x + width]
+        if view.shape[0] != height or view.shape[1] != width:
+            raise ValueError(f"The crop {width}x{height}+{x}+{y} does not fit a {pixels.shape[1]}x{pixels.shape[0]} frame")
+        yield view
+
+"""ON THE SUBJECT OF THE PIPELINE"""
+class FramePipeline:
+    """Reads the colors of one module off a stream of frames and solves them as they change."""
+
+    def __init__(
+        self,
+        module: str,
+        workers: int = 2,
+        on_answer: Callable[[int, tuple, str], Any] | None = None
+    ):
+        if module not in vision.READERS:
+            raise ValueError(f"Frames can be read for {', '.join(vision.READERS)}, not {module}")
+        self.module = get_module(module)
+        self.workers = workers
+        self.on_answer = on_answer
+        self.stats = FrameStats()
+
+        # The inputs a screenshot does not cover stay blank
+        self.blank = codec.decode_module(module, 0)
+        self.latest: Frame | None = None
+        self.closed = False
+        self.pending = Condition()
+
+        self.emitted = -1
+        self.inputs: tuple | None = None
+        self._emit = Lock()
+
+    def submit(self, frame: Frame):
+        with self.pending:
+            if self.latest is not None:
+                self.stats.dropped += 1
+            self.latest = frame
+            self.stats.stages["read"].add(frame, time.perf_counter())
+            self.pending.notify()
+
+    def _take(self) -> Frame | None:
+        with self.pending:
+            while self.latest is None and not self.closed:
+                self.pending.wait()
+            frame, self.latest = self.latest, None
+            return frame
+
+    def _work(self):
+        stages = self.stats.stages
+        while (frame := self._take()) is not None:
+            values = vision.read(self.module.name, frame.pixels)
+            stages["classify"].add(frame, time.perf_counter())
+
+            inputs = list(self.blank)
+            for arg, value in values.items():
+                inputs[arg] = value
+            inputs = tuple(inputs)
+            result = self.module.solve(*inputs)
+            text = self.module.format(result) if result is not None else narrowing.answer(self.module.name, inputs)
+
+            with self._emit:
+                if frame.index < self.emitted:
+                    self.stats.overtaken += 1
+                    continue
+                self.emitted = frame.index
+                stages["solve"].add(frame, time.perf_counter())
+                if inputs != self.inputs:
+                    self.inputs = inputs
+                    self.stats.changes += 1
+                    if self.on_answer is not None:
+                        self.on_answer(frame.index, inputs, text)
+
+    def run(self, frames: Iterable["np.ndarray"], fps: float = 0.0) -> FrameStats:
+        """Feed the frames through the workers, paced at `fps` like a live capture, or as fast as they read."""
+        tables.warm((self.module.name,))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="frames") as executor:
+            running = [executor.submit(self._work) for _ in range(self.workers)]
+            started = time.perf_counter()
+            try:
+                for index, pixels in enumerate(frames):
+                    if fps > 0:
+                        delay = started + index / fps - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    self.submit(Frame(index, pixels, time.perf_counter()))
+            finally:
+                with self.pending:
+                    self.closed = True
+                    self.pending.notify_all()
+            for future in running:
+                # A worker that failed raises here
+                future.result()
+        return self.stats
@@ -0,0 +1,108 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from solver.arrays import numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# One rung of a ladder, covering low <= value < high, None being unbounded
+Interval = tuple[float | None, float | None, Any]
+
+class IntervalTable:
+    """A threshold ladder compiled into sorted bounds, looked up by bisection.
+
+    Value i of `values` covers bounds[i - 1] <= value < bounds[i]. Every part of
+    `domain` that no rung covers, or that several rungs cover, is listed in
+    `problems`. A strict table raises ValueError with all of them instead, so a
+    broken ladder is caught when the rules are imported. Values outside the
+    domain get `default`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        intervals: Sequence[Interval],
+        domain: tuple[float | None, float | None] = (None, None),
+        default: Any = None,
+        strict: bool = True
+    ):
+        self.name = name
+        self.intervals = tuple(intervals)
+        self.domain = domain
+        self.default = default
+        self.problems: list[str] = []
+
+        points = sorted({
+            point for low, high, _ in self.intervals for point in (low, high) if point is not None
+        } | {point for point in domain if point is not None})
+
+        bounds: list[float] = []
+        values: list[Any] = []
+        # The pieces between consecutive points, the first and last ones unbounded
+        for low, high in zip([None, *points], [*points, None]):
+            covering = [
+                value for start, stop, value in self.intervals
+                if (start is None or (low is not None and start <= low))
+                and (stop is None or (high is not None and high <= stop))
+            ]
+            if self._in_domain(low, high):
+                if not covering:
+                    self.problems.append(f"{name}: nothing covers {_describe(low, high)}")
+                elif len(covering) > 1:
+                    self.problems.append(f"{name}: {_describe(low, high)} is covered by {', '.join(map(repr, covering))}")
+
+            value = covering[0] if covering else default
+            if values and values[-1] == value:
+                continue
+            if values:
+                bounds.append(low)
+            values.append(value)
+
+        if strict and self.problems:
+            raise ValueError("\n".join(self.problems))
+
+        self.bounds = tuple(bounds)
+        self.values = tuple(values)
+        self._numpy = None
+
+    def _in_domain(self, low: float | None, high: float | None) -> bool:
+        domain_low, domain_high = self.domain
+        if domain_low is not None and (low is None or low < domain_low):
+            return False
+        if domain_high is not None and (high is None or high > domain_high):
+            return False
+        return True
+
+    def index(self, value: float) -> int:
+        return bisect_right(self.bounds, value)
+
+    def lookup(self, value: float) -> Any:
+        return self.values[self.index(value)]
+
+    __call__ = lookup
+
+    def _arrays(self):
+        # NumPy is only imported once a ladder is looked up in bulk
+        if self._numpy is None:
+            np = numpy()
+            values = np.array(self.values, dtype=object)
+            if all(type(value) is int for value in self.values):
+                values = values.astype(np.int64)
+            self._numpy = (np, np.array(self.bounds), values)
+        return self._numpy
+
+    def index_many(self, values) -> "np.ndarray":
+        np, bounds, _ = self._arrays()
+        return np.searchsorted(bounds, np.asarray(values), side="right")
+
+    def lookup_many(self, values) -> "np.ndarray":
+        _, _, table = self._arrays()
+        return table[self.index_many(values)]
+
+    def __repr__(self) -> str:
+        return f"IntervalTable({self.name!r}, bounds={self.bounds!r}, values={self.values!r})"
+
+def _describe(low: float | None, high: float | None) -> str:
+    return f"[{'-inf' if low is None else low}, {'inf' if high is None else high})"
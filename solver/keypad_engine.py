@@ -0,0 +1,132 @@
+from functools import cache
+from typing import TYPE_CHECKING
+
+from solver.arrays import BATCH_THRESHOLD, numpy
+from solver.rules import KEYPAD_ORDER_LADDER, KEYPAD_ORDERS, KEYPAD_VALUE_BINS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# The ladders of the rule give each value its bin, and each 2z its index into KEYPAD_ORDERS
+# The top left keypad picks the starting x, the other three apply x * factor + offset
+START = (15, 20, 30, 10)
+STEPS = (
+    # Top right
+    ((1, 10), (2, 0), (3, 0), (1, -10)),
+    # Bottom left
+    ((2, 0), (3, 0), (1, -5), (1, 0)),
+    # Bottom right
+    ((2, 0), (1, 20), (1, 50), (3, 0)),
+)
+
+# The keypads take values from 0 to 99, giving 100^4 states
+SPACE_SIZE = 100 ** 4
+
+# The steps as arrays, built the first time something is solved in bulk
+@cache
+def _arrays():
+    np = numpy()
+    return (
+        np,
+        np.array(START, dtype=np.int64),
+        np.array([[factor for factor, _ in step] for step in STEPS], dtype=np.int64),
+        np.array([[offset for _, offset in step] for step in STEPS], dtype=np.int64),
+    )
+
+def order_index(tl: int, tr: int, bl: int, br: int) -> int:
+    """The index into KEYPAD_ORDERS for one set of keypad values."""
+    x = START[KEYPAD_VALUE_BINS(tl)]
+    for step, value in zip(STEPS, (tr, bl, br)):
+        factor, offset = step[KEYPAD_VALUE_BINS(value)]
+        x = x * factor + offset
+    # z = x - (tl + tr + bl + br) / 2 is binned on 2z so it stays an integer
+    return KEYPAD_ORDER_LADDER(2 * x - (tl + tr + bl + br))
+
+def solve(tl_raw: str, tr_raw: str, bl_raw: str, br_raw: str) -> tuple[str, ...] | None:
+    try:
+        tl = int(tl_raw)
+        tr = int(tr_raw)
+        bl = int(bl_raw)
+        br = int(br_raw)
+    except ValueError:
+        return None
+
+    return KEYPAD_ORDERS[order_index(tl, tr, bl, br)]
+
+def evaluate(tl, tr, bl, br) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Compute x, y, z and the order index for arrays of keypad values in one pass."""
+    np, start, factors, offsets = _arrays()
+
+    tl = np.asarray(tl, dtype=np.int64)
+    tr = np.asarray(tr, dtype=np.int64)
+    bl = np.asarray(bl, dtype=np.int64)
+    br = np.asarray(br, dtype=np.int64)
+
+    x = start[KEYPAD_VALUE_BINS.lookup_many(tl)]
+    for row, values in enumerate((tr, bl, br)):
+        bins = KEYPAD_VALUE_BINS.lookup_many(values)
+        x = x * factors[row, bins] + offsets[row, bins]
+
+    total = tl + tr + bl + br
+    z2 = 2 * x - total
+    order = KEYPAD_ORDER_LADDER.lookup_many(z2).astype(np.int8)
+
+    return x, total / 2, z2 / 2, order
+
+def orders(tl, tr, bl, br) -> "np.ndarray":
+    """The order index for arrays of keypad values."""
+    return evaluate(tl, tr, bl, br)[3]
+
+def decode_space(start: int, stop: int) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """The keypad values for a slice of the 100^4 space, top left being the most significant."""
+    np = _arrays()[0]
+    index = np.arange(start, stop, dtype=np.int64)
+    rest, br = np.divmod(index, 100)
+    rest, bl = np.divmod(rest, 100)
+    tl, tr = np.divmod(rest, 100)
+    return tl, tr, bl, br
+
+def sweep(start: int = 0, stop: int = SPACE_SIZE, chunk: int = 1_000_000):
+    """Yield (offset, order indices) for the space in chunks of bounded memory."""
+    for offset in range(start, stop, chunk):
+        yield offset, orders(*decode_space(offset, min(offset + chunk, stop)))
+
+# The values a keypad input can hold, parsing them is most of the cost of a batch
+_VALUES = {str(value): value for value in range(100)}
+
+# Four values under this size sum to less than the int64 limit, larger ones are left to the rule
+_BATCH_LIMIT = 1 << 60
+
+def _parse(raw: str) -> int | None:
+    value = _VALUES.get(raw)
+    if value is not None:
+        return value
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if -_BATCH_LIMIT < value < _BATCH_LIMIT else None
+
+def solve_batch(records: list[tuple]) -> list[tuple[str, ...] | None]:
+    """Solve raw keypad records with one vectorized pass, handing those it cannot hold to `solve`."""
+    if len(records) < BATCH_THRESHOLD:
+        return [solve(*record) for record in records]
+
+    np = _arrays()[0]
+    results: list[tuple[str, ...] | None] = [None] * len(records)
+    batched = []
+    parsed = []
+    for i, record in enumerate(records):
+        values = [_parse(value) for value in record] if len(record) == 4 else [None]
+        if None in values:
+            results[i] = solve(*record)
+            continue
+        batched.append(i)
+        parsed.append(values)
+
+    if batched:
+        values = np.array(parsed, dtype=np.int64)
+        indices = orders(values[:, 0], values[:, 1], values[:, 2], values[:, 3]).tolist()
+        for i, index in zip(batched, indices):
+            results[i] = KEYPAD_ORDERS[index]
+    return results
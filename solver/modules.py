@@ -0,0 +1,54 @@
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from solver import answers, keypad_engine, rules
+from solver.tables import TABLES
+
+# Engines for the modules whose space is too big to tabulate
+ENGINES: dict[str, Callable[..., Any]] = {
+    "keypads": keypad_engine.solve,
+}
+
+class Module(NamedTuple):
+    name: str
+    # The names of the inputs, in the order the solver takes them
+    fields: tuple[str, ...]
+    # The rule as written, kept as the reference for the faster engines
+    rule: Callable[..., Any]
+    format: Callable[[Any], str]
+    # The engine answers are served from, the rule itself if there is none
+    solve: Callable[..., Any]
+
+def _module(name: str, fields: tuple[str, ...], rule: Callable[..., Any], format: Callable[[Any], str]) -> Module:
+    table = TABLES.get(name)
+    engine = table.lookup if table is not None else ENGINES.get(name, rule)
+    return Module(name, fields, rule, format, engine)
+
+# Keyed by the widget id prefix each module uses in the TUI
+MODULES: dict[str, Module] = {
+    module.name: module for module in [
+        _module("wires", ("selected", "light"), rules.wires, answers.wires),
+        _module("button", ("color", "text"), rules.button, answers.button),
+        _module("hexadecimal", ("code",), rules.hexadecimal, answers.hexadecimal),
+        _module("tiles", ("left", "right"), rules.tiles, answers.tiles),
+        _module("keypads", ("tl", "tr", "bl", "br"), rules.keypads, answers.keypads),
+        _module("binary", ("switches",), rules.binary, answers.binary),
+        _module("mathematics", ("code",), rules.mathematics, answers.mathematics),
+        _module("color-code", ("colors", "letters"), rules.color_code, answers.color_code),
+        _module("multi-buttons", ("code",), rules.multi_buttons, answers.multi_buttons),
+        _module("timing", ("code",), rules.timing, answers.timing),
+    ]
+}
+
+def get_module(name: str) -> Module:
+    try:
+        return MODULES[name]
+    except KeyError:
+        raise ValueError(f"Unknown module '{name}', expected one of: {', '.join(MODULES)}") from None
+
+def solve(name: str, *args: Any) -> Any:
+    return get_module(name).solve(*args)
+
+def answer(name: str, *args: Any) -> str:
+    module = get_module(name)
+    return module.format(module.solve(*args))
@@ -0,0 +1,236 @@
+"""The answers a typed code can still give after each character."""
+from array import array
+from collections.abc import Callable, Sequence
+from functools import cache, reduce
+from itertools import product
+from operator import or_
+from threading import Lock
+from typing import Any
+
+from solver import codec, keypad_engine, rules, tables
+from solver.answers import NO_SOLUTION
+from solver.cache import normalize
+from solver.modules import get_module
+
+# The most answers listed while several are still possible
+CANDIDATE_LIMIT = 6
+
+"""ON THE SUBJECT OF TYPED CODES
+
+The tables of the typed codes are indexed in the order the characters are typed,
+so every prefix is one slice of the table. The answers each slice can still give
+are stored as bitmasks over the table's palette, one level per typed character,
+so narrowing a prefix is a single lookup.
+"""
+class PrefixIndex:
+    def __init__(self, name: str, arg: int, alphabets: Sequence[str]):
+        self.name = name
+        # Which argument of the module is typed, and the characters its table covers per position
+        self.arg = arg
+        self.alphabets = tuple(alphabets)
+        self.indexes = tuple({ch: i for i, ch in enumerate(alphabet)} for alphabet in alphabets)
+        self.masked: codec.Masked = codec.FIELDS[name].fields[arg]
+
+        self.levels: list[Sequence[int]] | None = None
+        self._lock = Lock()
+
+    @property
+    def table(self) -> tables.AnswerTable:
+        return tables.TABLES[self.name]
+
+    def build(self) -> "PrefixIndex":
+        with self._lock:
+            if self.levels is not None:
+                return self
+            table = self.table.build()
+
+            # Small palettes fit a machine word per prefix
+            typecode = "Q" if len(table.palette) <= 64 else None
+            width = len(self.alphabets[-1])
+            level: Sequence[int] = [0] * (table.size // width)
+            for i, code in enumerate(table.codes):
+                level[i // width] |= 1 << code
+
+            levels = []
+            for alphabet in reversed(self.alphabets[:-1]):
+                levels.append(array(typecode, level) if typecode else level)
+                width = len(alphabet)
+                level = [reduce(or_, level[i:i + width]) for i in range(0, len(level), width)]
+            levels.append(level)
+            self.levels = levels[::-1]
+        return self
+
+    def digits(self, value: str) -> list[int] | None:
+        masked = self.masked
+        typed = "".join(value[slot] for slot in masked.slots if slot < len(value))
+        # The separator after the last character may be left off
+        if masked.show(typed)[:len(value)] != value:
+            return None
+
+        digits = []
+        for ch, index in zip(typed, self.indexes):
+            digit = index.get(ch)
+            if digit is None:
+                return None
+            digits.append(digit)
+        return digits
+
+    def mask(self, digits: Sequence[int]) -> int:
+        table = self.table
+        prefix = 0
+        for digit, alphabet in zip(digits, self.alphabets):
+            prefix = prefix * len(alphabet) + digit
+
+        if len(digits) == len(self.alphabets):
+            return 1 << table.codes[prefix]
+        if self.levels is not None:
+            return self.levels[len(digits)][prefix]
+
+        # Until the levels are built the slice is scanned
+        width = 1
+        for alphabet in self.alphabets[len(digits):]:
+            width *= len(alphabet)
+        return reduce(or_, (1 << code for code in set(table.codes[prefix * width:(prefix + 1) * width])))
+
+    def candidates(self, value: str) -> list[Any]:
+        if not self.table.built:
+            return []
+        # Nothing is narrowed before the first character is typed
+        digits = self.digits(value)
+        if not digits:
+            return []
+        mask = self.mask(digits)
+        palette = self.table.palette
+        return [palette[i] for i in range(mask.bit_length()) if mask >> i & 1 and palette[i] is not None]
+
+DIGITS = "0123456789"
+
+PREFIXES: dict[str, PrefixIndex] = {
+    index.name: index for index in [
+        PrefixIndex("mathematics", 0, [tables.MATHEMATICS_LETTERS] * 4),
+        PrefixIndex("color-code", 1, [tables.COLOR_CODE_LETTERS] * 5),
+        PrefixIndex("multi-buttons", 0, [DIGITS] * 6),
+        PrefixIndex("timing", 0, [DIGITS, DIGITS, tables.TIMING_LETTERS, tables.TIMING_LETTERS]),
+    ]
+}
+
+def _typed(name: str, inputs: tuple) -> list[Any]:
+    return PREFIXES[name].candidates(inputs[PREFIXES[name].arg])
+
+def _color_code(inputs: tuple) -> list[Any]:
+    colors, letters = inputs
+    if len(colors) != 5:
+        return []
+
+    # The lines that are not picked yet can still be any color
+    sums = {0}
+    for color in colors:
+        weights = set(rules.COLOR_CODE_COLORS.values()) if color is None else {rules.COLOR_CODE_COLORS[color]}
+        sums = {total + weight for total in sums for weight in weights}
+
+    candidates = {}
+    for x in PREFIXES["color-code"].candidates(letters):
+        for y in sorted(sums):
+            candidates.setdefault(x - y)
+    return list(candidates)
+
+"""ON THE SUBJECT OF SELECTS"""
+def _choices(name: str, inputs: tuple) -> list[Any]:
+    # Selects that are still blank can become any of their options
+    options = [
+        field.values[1:] if value is None else (value,)
+        for field, value in zip(codec.FIELDS[name].fields, inputs)
+    ]
+    solve = get_module(name).solve
+    candidates = {}
+    for args in product(*options):
+        result = solve(*args)
+        if result is not None:
+            candidates.setdefault(result)
+    return list(candidates)
+
+"""ON THE SUBJECT OF THE KEYPADS"""
+@cache
+def keypad_bins(raw: str) -> tuple[tuple[int, int, int], ...]:
+    """The bins a keypad's value can still fall in, as (bin, lowest value, highest value)."""
+    if raw == "":
+        values = range(100)
+    elif len(raw) == 1 and raw.isascii() and raw.isdigit():
+        # One digit is either the whole value or the first of two
+        values = sorted({int(raw), *range(int(raw) * 10, int(raw) * 10 + 10)})
+    elif len(raw) == 2 and raw.isascii() and raw.isdigit():
+        values = (int(raw),)
+    else:
+        return ()
+
+    bins: dict[int, tuple[int, int]] = {}
+    for value in values:
+        index = keypad_engine.KEYPAD_VALUE_BINS(value)
+        low, high = bins.get(index, (value, value))
+        bins[index] = (min(low, value), max(high, value))
+    return tuple((index, low, high) for index, (low, high) in sorted(bins.items()))
+
+def _keypads(inputs: tuple) -> list[Any]:
+    tl, *rest = (keypad_bins(raw) for raw in inputs)
+
+    # Each state is x with the bounds of the total so far, states that meet are merged
+    states = {(keypad_engine.START[index], low, high) for index, low, high in tl}
+    for step, bins in zip(keypad_engine.STEPS, rest):
+        states = {
+            (x * step[index][0] + step[index][1], total_low + low, total_high + high)
+            for x, total_low, total_high in states
+            for index, low, high in bins
+        }
+
+    # Within one state the total takes every value between its bounds
+    ladder = keypad_engine.KEYPAD_ORDER_LADDER
+    orders = set()
+    for x, low, high in states:
+        first = ladder.index(2 * x - high)
+        last = ladder.index(2 * x - low)
+        orders.update(ladder.values[first:last + 1])
+    return [rules.KEYPAD_ORDERS[i] for i in sorted(orders)]
+
+# How the answers still possible are found for each module, the others are complete whatever is entered
+NARROWERS: dict[str, Callable[[tuple], list[Any]]] = {
+    "button": lambda inputs: _choices("button", inputs),
+    "tiles": lambda inputs: _choices("tiles", inputs),
+    "keypads": _keypads,
+    "mathematics": lambda inputs: _typed("mathematics", inputs),
+    "color-code": _color_code,
+    "multi-buttons": lambda inputs: _typed("multi-buttons", inputs),
+    "timing": lambda inputs: _typed("timing", inputs),
+}
+
+def candidates(name: str, inputs: tuple) -> list[Any]:
+    """Every answer the inputs can still lead to once the rest is entered, empty before anything is."""
+    module = get_module(name)
+    narrow = NARROWERS.get(name)
+    try:
+        if narrow is None or normalize(inputs) == codec.decode_module(name, 0):
+            result = module.solve(*inputs)
+            return [] if result is None else [result]
+        return narrow(tuple(inputs))
+    except (ValueError, TypeError, KeyError, IndexError):
+        return []
+
+def describe(name: str, possible: Sequence[Any]) -> str:
+    format = get_module(name).format
+    if not possible:
+        return NO_SOLUTION
+    if len(possible) == 1:
+        return format(possible[0])
+
+    lines = [format(answer) for answer in possible[:CANDIDATE_LIMIT]]
+    if len(possible) > CANDIDATE_LIMIT:
+        lines.append(f"... and {len(possible) - CANDIDATE_LIMIT} more")
+    return f"{len(possible)} answers are still possible:\n" + "\n".join(lines)
+
+def answer(name: str, inputs: tuple) -> str:
+    return describe(name, candidates(name, inputs))
+
+def warm():
+    """Build the tables and prefix levels, for example from a worker thread at startup."""
+    tables.warm()
+    for index in PREFIXES.values():
+        index.build()
@@ -0,0 +1,129 @@
+import os
+import time
+from pathlib import Path
+from threading import Event
+from types import FunctionType
+from typing import Any, NamedTuple
+
+from solver import keypad_engine, narrowing, ruledata, rules, tables
+
+# The parts of a section the tables, engines and widgets are laid out from, a patch that changes them needs a restart.
+# The keypads engine looks its bins and orders up in the ladders themselves, so those swap in whatever changes.
+LAYOUT_KEYS: dict[str, tuple[str, ...]] = {
+    "tiles": ("values",),
+    "binary": ("switches",),
+    "mathematics": ("digits",),
+    "color-code": ("colors", "letters"),
+    "timing": ("values",),
+}
+
+class Prepared(NamedTuple):
+    """A rule file compiled off the event loop, ready to be swapped in by `apply`."""
+    rule_file: ruledata.RuleFile
+    # The modules whose rules changed
+    modules: tuple[str, ...]
+    constants: dict[str, Any]
+    # The enumerated palette and codes of each changed module with a table
+    tables: dict[str, tuple[list[Any], Any]]
+    # Changed modules that cannot be swapped without a restart
+    skipped: dict[str, str]
+    seconds: float
+
+def _layout(name: str, section: Any) -> Any:
+    layout = []
+    for key in LAYOUT_KEYS.get(name, ()):
+        value = section.get(key) if isinstance(section, dict) else None
+        if isinstance(value, dict):
+            value = tuple(value)
+        layout.append(value)
+    return tuple(layout)
+
+def changed_modules(old: ruledata.RuleFile, new: ruledata.RuleFile) -> list[str]:
+    return [name for name in ruledata.COMPILERS if old.data.get(name) != new.data.get(name)]
+
+def prepare(rule_file: ruledata.RuleFile) -> Prepared:
+    """Compile the changed sections and enumerate their tables, without touching the live rules."""
+    started = time.perf_counter()
+    current = rules.RULE_FILE
+
+    modules = []
+    skipped = {}
+    for name in changed_modules(current, rule_file):
+        if _layout(name, current.data.get(name)) != _layout(name, rule_file.data.get(name)):
+            skipped[name] = f"the {name} options changed, restart to use them"
+        else:
+            modules.append(name)
+
+    constants = ruledata.compile_rules(rule_file, modules)
+
+    # The rules are cloned onto the new constants so the live ones keep answering meanwhile
+    namespace = dict(vars(rules))
+    namespace.update(constants)
+    enumerated = {}
+    for name in modules:
+        table = tables.TABLES.get(name)
+        if table is None:
+            continue
+        rule = FunctionType(table.rule.__code__, namespace, table.rule.__name__, table.rule.__defaults__)
+        try:
+            enumerated[name] = tables.AnswerTable(name, table.size, rule, table.encode, table.decode).enumerate()
+        except (KeyError, TypeError, ValueError) as error:
+            # Data of the right shape can still break a rule, such as a value of the wrong type
+            raise ValueError(f"{rule_file.path}: the {name} rules are invalid: {error}") from None
+
+    return Prepared(rule_file, tuple(modules), constants, enumerated, skipped, time.perf_counter() - started)
+
+def apply(prepared: Prepared):
+    """Swap the prepared rules in. Call it from the thread that solves, it does not block on anything."""
+    vars(rules).update(prepared.constants)
+    rules.RULE_FILE = prepared.rule_file
+
+    if "keypads" in prepared.modules:
+        keypad_engine.KEYPAD_VALUE_BINS = rules.KEYPAD_VALUE_BINS
+        keypad_engine.KEYPAD_ORDER_LADDER = rules.KEYPAD_ORDER_LADDER
+        narrowing.keypad_bins.cache_clear()
+
+    for name, (palette, codes) in prepared.tables.items():
+        tables.TABLES[name].swap(palette, codes)
+        index = narrowing.PREFIXES.get(name)
+        if index is not None:
+            # Narrowing scans the table until the levels are built again
+            index.levels = None
+
+class RuleWatcher:
+    """Polls a rule file and hands back the new contents once they change."""
+
+    def __init__(self, path: Path, interval: float = 1.0):
+        self.path = Path(path)
+        self.interval = interval
+        self.stopped = Event()
+        self._stamp = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> ruledata.RuleFile | None:
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        rule_file = ruledata.load(self.path)
+        if rule_file.raw == rules.RULE_FILE.raw:
+            return None
+        return rule_file
+
+    def wait(self) -> ruledata.RuleFile | None:
+        """Block until the file changes or `stop` is called, returning None for the latter."""
+        while not self.stopped.wait(self.interval):
+            rule_file = self.poll()
+            if rule_file is not None:
+                return rule_file
+        return None
+
+    def stop(self):
+        self.stopped.set()
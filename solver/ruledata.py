@@ -0,0 +1,140 @@
+"""Loading the rule file and compiling it into the tables the rules look up."""
+import json
+import os
+import re
+from collections.abc import Callable, Collection
+from typing import Any, NamedTuple
+
+from solver.intervals import IntervalTable
+
+# The rules are read when the solver is imported, so this module keeps to os.path and leaves
+# pathlib and hashlib to the commands that need them
+
+# The rules shipped with the solver, DEFUSAL_RULES points at a patched copy instead
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "rules.json")
+
+class RuleFile(NamedTuple):
+    path: str
+    raw: bytes
+    data: dict[str, Any]
+
+    @property
+    def digest(self) -> str:
+        """The sha256 of the file, which the answer file is keyed on."""
+        import hashlib
+
+        return hashlib.sha256(self.raw).hexdigest()
+
+def rules_path() -> str:
+    return os.environ.get("DEFUSAL_RULES") or DEFAULT_PATH
+
+def load(path: str | os.PathLike | None = None) -> RuleFile:
+    path = os.fspath(path) if path is not None else rules_path()
+    with open(path, "rb") as file:
+        raw = file.read()
+    try:
+        data = json.loads(raw)
+    except ValueError as error:
+        raise ValueError(f"{path} is not valid JSON: {error}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} should hold an object with a section per module")
+    return RuleFile(path, raw, data)
+
+def ladder(name: str, rungs: list[list[Any]], domain: list[Any] | None = None) -> IntervalTable:
+    return IntervalTable(name, [tuple(rung) for rung in rungs], domain=tuple(domain or (None, None)))
+
+"""ON THE SUBJECT OF DECISION LISTS
+
+A decision list is tried in order and the first condition that holds gives the
+answer. A condition may list switches (counted from 1) that are all "on" or all
+"off", and "on_more_than" or "off_more_than" counts. One with no condition
+always holds. The list is compiled into the answer of every switch state.
+"""
+CONDITION_KEYS = {"on", "off", "on_more_than", "off_more_than", "answer"}
+
+def _holds(condition: dict[str, Any], on: Collection[int], count: int) -> bool:
+    return (
+        all(switch in on for switch in condition.get("on", ()))
+        and not any(switch in on for switch in condition.get("off", ()))
+        and len(on) > condition.get("on_more_than", -1)
+        and count - len(on) > condition.get("off_more_than", -1)
+    )
+
+def decisions(count: int, conditions: list[dict[str, Any]]) -> tuple[Any, ...]:
+    for condition in conditions:
+        unknown = condition.keys() - CONDITION_KEYS
+        if unknown:
+            raise ValueError(f"Unknown condition {', '.join(sorted(unknown))}, expected one of {', '.join(sorted(CONDITION_KEYS))}")
+        if "answer" not in condition:
+            raise ValueError(f"The condition {condition} has no answer")
+
+    answers = []
+    for mask in range(1 << count):
+        on = {i + 1 for i in range(count) if mask >> i & 1}
+        answers.append(next((condition["answer"] for condition in conditions if _holds(condition, on, count)), None))
+    return tuple(answers)
+
+"""ON THE SUBJECT OF MODULES"""
+# The keypads rule has a branch for each of four bins and picks one of four orders
+KEYPAD_BINS = 4
+KEYPAD_ORDERS = 4
+
+def _indexes(table: IntervalTable, count: int) -> IntervalTable:
+    wrong = [value for value in table.values if type(value) is not int or not 0 <= value < count]
+    if wrong:
+        raise ValueError(f"{table.name} must be numbered 0 to {count - 1}, not {', '.join(map(repr, wrong))}")
+    return table
+
+def _keypads(section: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "KEYPAD_VALUE_BINS": _indexes(ladder("keypad values", section["value_bins"]), KEYPAD_BINS),
+        "KEYPAD_ORDER_LADDER": _indexes(ladder("keypad orders", section["order_ladder"]), KEYPAD_ORDERS),
+    }
+
+# The menu, the codec and the answer table are all laid out for seven switches
+BINARY_SWITCHES = 7
+
+def _binary(section: dict[str, Any]) -> dict[str, Any]:
+    if section["switches"] != BINARY_SWITCHES:
+        raise ValueError(f"the module has {BINARY_SWITCHES} switches, not {section['switches']!r}")
+    return {
+        "BINARY_SWITCHES": BINARY_SWITCHES,
+        "BINARY_ANSWERS": decisions(BINARY_SWITCHES, section["conditions"]),
+    }
+
+def _mathematics(section: dict[str, Any]) -> dict[str, Any]:
+    letters = "".join(re.escape(letter) for letter in section["digits"])
+    return {
+        "MATHEMATICS_DIGITS": dict(section["digits"]),
+        "MATHEMATICS_PATTERN": re.compile(f"[{letters}]{{2}}-[{letters}]{{2}}"),
+    }
+
+def _timing(section: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "TIMING_VALUES": dict(section["values"]),
+        "TIMING_COLORS": ladder("timing colors", section["colors"], section.get("domain")),
+    }
+
+# Each section of the rule file compiles into the constants the rule functions read
+COMPILERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "keypads": _keypads,
+    "tiles": lambda section: {"TILE_VALUES": dict(section["values"])},
+    "binary": _binary,
+    "mathematics": _mathematics,
+    "color-code": lambda section: {
+        "COLOR_CODE_COLORS": dict(section["colors"]),
+        "COLOR_CODE_LETTERS": dict(section["letters"]),
+    },
+    "timing": _timing,
+}
+
+def compile_rules(rule_file: RuleFile, modules: Collection[str] | None = None) -> dict[str, Any]:
+    constants: dict[str, Any] = {}
+    for name, compiler in COMPILERS.items():
+        if modules is not None and name not in modules:
+            continue
+        try:
+            constants.update(compiler(rule_file.data[name]))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"{rule_file.path}: the {name} rules are invalid: {error}") from None
+    return constants
@@ -0,0 +1,252 @@
+"""The rule of every module, as plain functions of its inputs."""
+from collections.abc import Collection, Sequence
+
+from solver import ruledata
+
+# The data half of the rules lives in rules.json, compiled into the constants below
+RULE_FILE = ruledata.load()
+_COMPILED = ruledata.compile_rules(RULE_FILE)
+
+# The values of the options in the wires selection list, in order
+WIRE_COLORS = ("White", "Red", "Yellow", "Green", "Blue", "Orange")
+WIRE_LIGHTS = ("Red", "Yellow", "Green", "Blue", "White")
+
+BUTTON_COLORS = ("Blue", "Red", "White", "Grey")
+BUTTON_TEXTS = ("Detonate", "Abort", "Blank")
+
+KEYPAD_NAMES = {
+    'tl': "Top Left",
+    'tr': "Top Right",
+    'bl': "Bottom Left",
+    'br': "Bottom Right"
+}
+
+# The orders the keypads can be clicked in, indexed by the keypads engine
+KEYPAD_ORDERS = (
+    ("tl", "tr", "bl", "br"),
+    ("tl", "tr", "br", "bl"),
+    ("br", "bl", "tr", "tl"),
+    ("tr", "bl", "tl", "br"),
+)
+
+"""ON THE SUBJECT OF THE WIRES"""
+def wires(selected: Collection[int], light: str | None) -> int | None:
+    active_wires = [WIRE_COLORS[i] for i in selected]
+    wire_count = len(active_wires)
+
+    if wire_count == 3:
+        if "Red" not in active_wires:
+            return 1
+        elif "White" in active_wires:
+            return 2
+        elif "Blue" in active_wires:
+            return 3
+    elif wire_count == 4:
+        if "Green" not in active_wires:
+            return 1
+        elif "Blue" not in active_wires:
+            return 2
+        elif "White" not in active_wires:
+            return 3
+        else:
+            return 4
+    elif wire_count == 5 and light is not None:
+        if light == "Red":
+            return 1
+        elif light == "Green":
+            return 2
+        elif light == "Blue":
+            return 3
+        elif light == "Yellow":
+            return 4
+        else:
+            return 5
+
+    return None
+
+"""ON THE SUBJECT OF THE BUTTON"""
+def button(color: str | None, text: str | None) -> int | None:
+    if color == "Blue" and text == "Detonate":
+        return 1
+    elif color == "Red":
+        return 2
+    elif text == "Abort":
+        return 3
+    elif color == "White" or color == "Grey":
+        return 4
+
+    return None
+
+"""ON THE SUBJECT OF HEXADECIMAL"""
+def hexadecimal(raw: str) -> str | None:
+    try:
+        code = ''.join(chr(int(h, 16)) for h in raw.split("-"))
+    except (ValueError, OverflowError):
+        # A part too big for chr() is as invalid as a part that is not hexadecimal
+        return None
+
+    if len(code) != 4:
+        return None
+
+    return code
+
+"""ON THE SUBJECT OF THE TILES"""
+TILE_VALUES = _COMPILED["TILE_VALUES"]
+
+def tiles(left: str | None, right: str | None) -> int | None:
+    if left is None or right is None:
+        return None
+
+    return TILE_VALUES[left] + TILE_VALUES[right]
+
+"""ON THE SUBJECT OF THE KEYPADS"""
+# Every keypad value falls in one of four bins: below 10, 10-19, 20-79 and 80 up
+KEYPAD_VALUE_BINS = _COMPILED["KEYPAD_VALUE_BINS"]
+
+# The order is picked by 2z: z <= 0, z < 20, z < 50, z < 90 and 90 up
+KEYPAD_ORDER_LADDER = _COMPILED["KEYPAD_ORDER_LADDER"]
+
+def keypads(tl_raw: str, tr_raw: str, bl_raw: str, br_raw: str) -> tuple[str, ...] | None:
+    try:
+        tl = int(tl_raw)
+        tr = int(tr_raw)
+        bl = int(bl_raw)
+        br = int(br_raw)
+    except ValueError:
+        return None
+
+    tl_bin, tr_bin, bl_bin, br_bin = (KEYPAD_VALUE_BINS(value) for value in (tl, tr, bl, br))
+
+    if tl_bin == 0:
+        x = 15
+    elif tl_bin == 1:
+        x = 20
+    elif tl_bin == 2:
+        x = 30
+    else:
+        x = 10
+
+    if tr_bin == 0:
+        x += 10
+    elif tr_bin == 1:
+        x *= 2
+    elif tr_bin == 2:
+        x *= 3
+    else:
+        x -= 10
+
+    if bl_bin == 0:
+        x *= 2
+    elif bl_bin == 1:
+        x *= 3
+    elif bl_bin == 2:
+        x -= 5
+
+    if br_bin == 0:
+        x *= 2
+    elif br_bin == 1:
+        x += 20
+    elif br_bin == 2:
+        x += 50
+    else:
+        x *= 3
+
+    # z = x - (tl + tr + bl + br) / 2 is compared as 2z so it stays an integer
+    return KEYPAD_ORDERS[KEYPAD_ORDER_LADDER(2 * x - (tl + tr + bl + br))]
+
+"""ON THE SUBJECT OF BINARY"""
+# The answer of every switch state, from the decision list in rules.json
+BINARY_SWITCHES = _COMPILED["BINARY_SWITCHES"]
+BINARY_ANSWERS = _COMPILED["BINARY_ANSWERS"]
+
+def binary(switches: Sequence[bool]) -> int:
+    if len(switches) != BINARY_SWITCHES:
+        raise ValueError(f"Expected {BINARY_SWITCHES} switches, got {len(switches)}")
+
+    mask = 0
+    for i, value in enumerate(switches):
+        if value:
+            mask |= 1 << i
+    return BINARY_ANSWERS[mask]
+
+"""ON THE SUBJECT OF MATHEMATICS"""
+MATHEMATICS_DIGITS = _COMPILED["MATHEMATICS_DIGITS"]
+MATHEMATICS_PATTERN = _COMPILED["MATHEMATICS_PATTERN"]
+
+def mathematics(raw: str) -> int | None:
+    if not MATHEMATICS_PATTERN.fullmatch(raw):
+        return None
+
+    split = raw.split("-")
+    left = int(''.join(MATHEMATICS_DIGITS[ch] for ch in split[0]))
+    right = int(''.join(MATHEMATICS_DIGITS[ch] for ch in split[1]))
+    return left * right
+
+"""ON THE SUBJECT OF COLOR CODE"""
+COLOR_CODE_COLORS = _COMPILED["COLOR_CODE_COLORS"]
+COLOR_CODE_LETTERS = _COMPILED["COLOR_CODE_LETTERS"]
+
+def color_code(colors: Sequence[str | None], letters: str) -> int | None:
+    if len(letters) != 5 or any(ch not in COLOR_CODE_LETTERS for ch in letters):
+        return None
+
+    if len(colors) != 5 or None in colors:
+        return None
+
+    y = sum(COLOR_CODE_COLORS[color] for color in colors)
+    x = sum(COLOR_CODE_LETTERS[ch] for ch in letters)
+    return x - y
+
+"""ON THE SUBJECT OF MULTI BUTTONS"""
+MULTI_BUTTON_PAIRS = (("Red", "Orange"), ("Yellow", "Green"), ("Blue", "Purple"))
+
+def multi_buttons(raw: str) -> tuple[str, ...] | None:
+    if len(raw) != 6:
+        return None
+
+    try:
+        nums = [int(ch) for ch in raw]
+    except ValueError:
+        return None
+
+    # The first three buttons are picked from their own pair
+    ordered = [pair[0] if num < 6 else pair[1] for num, pair in zip(nums, MULTI_BUTTON_PAIRS)]
+
+    if nums[3] < 7:
+        order = (2, 3, 1)
+    elif nums[4] < 7:
+        order = (3, 2, 1)
+    elif nums[5] < 7:
+        order = (1, 2, 3)
+    else:
+        order = (1, 3, 2)
+
+    # The remaining buttons are the other half of each pair
+    for i in order:
+        pair = MULTI_BUTTON_PAIRS[i - 1]
+        ordered.append(pair[1] if pair[0] in ordered else pair[0])
+
+    return tuple(ordered)
+
+"""ON THE SUBJECT OF TIMING"""
+TIMING_VALUES = _COMPILED["TIMING_VALUES"]
+
+# Each color covers its whole hundred, 59, 99, 199 and so on included
+TIMING_COLORS = _COMPILED["TIMING_COLORS"]
+
+def timing(raw: str) -> str | None:
+    if len(raw) != 5:
+        return None
+
+    split = raw.split("-")
+
+    if len(split) != 2 or any(ch not in TIMING_VALUES for ch in split[1]):
+        return None
+
+    try:
+        left = int(split[0][0]) + int(split[0][1])
+    except (ValueError, IndexError):
+        return None
+
+    right = sum(TIMING_VALUES[ch] for ch in split[1])
+    return TIMING_COLORS(left * right)
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any
+
+from solver import tables
+from solver.batch import solve_many
+from solver.modules import get_module
+from solver.stats import percentile
+from solver.stream import record_inputs
+
+# The service only ever listens on the loopback interface
+HOST = "127.0.0.1"
+DEFAULT_PORT = 7531
+
+class ModuleMetrics:
+    __slots__ = ("requests", "errors", "batches", "latencies")
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        # The most recent request latencies, in seconds
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = [latency * 1000 for latency in sorted(self.latencies)]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p99_ms": percentile(latencies, 0.99),
+        }
+
+class SolverService:
+    """Answers line-delimited JSON requests, solving concurrent requests for a module as one batch.
+
+    A request is a record in the shape `python -m solver stream` reads, for example
+    `{"id": 1, "module": "timing", "code": "99-AA"}`. The answer line echoes the id.
+    `{"command": "stats"}` returns the request rate and latency figures.
+    """
+
+    def __init__(self, max_batch: int = 4096, max_delay: float = 0.0, window: int = 10_000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.window = window
+
+        self.pending: dict[str, list[tuple[tuple, asyncio.Future]]] = {}
+        self.metrics: dict[str, ModuleMetrics] = {}
+        self.started = time.perf_counter()
+        self.connections = 0
+
+    def _metrics(self, name: str) -> ModuleMetrics:
+        metrics = self.metrics.get(name)
+        if metrics is None:
+            metrics = self.metrics[name] = ModuleMetrics(self.window)
+        return metrics
+
+    def submit(self, name: str, inputs: tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self.pending.setdefault(name, [])
+        pending.append((inputs, future))
+
+        if len(pending) >= self.max_batch:
+            self.flush(name)
+        elif len(pending) == 1:
+            # Everything submitted before the flush runs joins the same batch
+            if self.max_delay:
+                loop.call_later(self.max_delay, self.flush, name)
+            else:
+                loop.call_soon(self.flush, name)
+
+        return future
+
+    def flush(self, name: str):
+        batch = self.pending.pop(name, None)
+        if not batch:
+            return
+
+        self._metrics(name).batches += 1
+        try:
+            results = solve_many(name, [inputs for inputs, _ in batch])
+        except Exception:
+            # Solve them one by one so a bad request only fails itself
+            results = None
+
+        for i, (inputs, future) in enumerate(batch):
+            if future.done():
+                continue
+            if results is not None:
+                future.set_result(results[i])
+                continue
+            try:
+                future.set_result(solve_many(name, [inputs])[0])
+            except Exception as error:
+                future.set_exception(error)
+
+    def stats(self) -> dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        requests = sum(metrics.requests for metrics in self.metrics.values())
+        return {
+            "uptime": elapsed,
+            "connections": self.connections,
+            "requests": requests,
+            "requests_per_sec": requests / elapsed if elapsed else 0.0,
+            "modules": {name: metrics.as_dict() for name, metrics in self.metrics.items()},
+        }
+
+    async def respond(self, line: bytes) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            return {"error": f"invalid JSON: {error}"}
+        if not isinstance(record, dict):
+            return {"error": "a request must be a JSON object"}
+
+        if record.get("command") == "stats":
+            return {"id": record.get("id"), "stats": self.stats()}
+
+        name = record.get("module")
+        response: dict[str, Any] = {"id": record.get("id"), "module": name}
+        try:
+            module = get_module(name)
+        except (ValueError, TypeError) as error:
+            response["error"] = f"{type(error).__name__}: {error}"
+            return response
+
+        metrics = self._metrics(name)
+        try:
+            answer = await self.submit(name, record_inputs(record, module.fields))
+            text = module.format(answer)
+        except Exception as error:
+            # Whatever a request raises is its own answer, the connection keeps serving the others
+            metrics.errors += 1
+            response["error"] = f"{type(error).__name__}: {error}"
+            return response
+
+        metrics.requests += 1
+        metrics.latencies.append(time.perf_counter() - started)
+        response["answer"] = answer
+        response["text"] = text
+        return response
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # A connection stays open for as many requests as the client sends
+        self.connections += 1
+        tasks: set[asyncio.Task] = set()
+
+        async def answer(line: bytes):
+            response = await self.respond(line)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve(self, port: int = DEFAULT_PORT, ready: asyncio.Event | None = None):
+        # Lookups use the rules until the tables are built in the background
+        asyncio.get_running_loop().run_in_executor(None, tables.warm)
+        server = await asyncio.start_server(self.handle, HOST, port)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+def run(port: int = DEFAULT_PORT, max_batch: int = 4096, max_delay: float = 0.0):
+    service = SolverService(max_batch=max_batch, max_delay=max_delay)
+    print(f"Serving on {HOST}:{port}")
+    try:
+        asyncio.run(service.serve(port))
+    except KeyboardInterrupt:
+        pass
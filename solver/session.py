@@ -0,0 +1,128 @@
+from collections.abc import Hashable, Iterator
+from typing import Any
+
+from solver import codec
+from solver.cache import AnswerCache, normalize
+from solver.modules import get_module
+
+class ModuleState:
+    """The inputs entered for one module of a bomb and, once solved, its answer."""
+
+    __slots__ = ("inputs", "result", "text")
+
+    def __init__(self, inputs: Hashable, result: Any = None, text: str | None = None):
+        self.inputs = inputs
+        self.result = result
+        self.text = text
+
+    @property
+    def solved(self) -> bool:
+        return self.text is not None
+
+class Bomb:
+    """The modules entered for one bomb. Only modules that were entered take up room."""
+
+    __slots__ = ("name", "states")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.states: dict[str, ModuleState] = {}
+
+    def enter(self, module: str, inputs: tuple):
+        get_module(module)
+        inputs = normalize(inputs)
+        state = self.states.get(module)
+        if state is None or state.inputs != inputs:
+            self.states[module] = ModuleState(inputs)
+
+    def record(self, module: str, inputs: tuple, result: Any, text: str):
+        """Store inputs that were already solved elsewhere, such as on screen."""
+        self.states[module] = ModuleState(normalize(inputs), result, text)
+
+    def solve(self, cache: AnswerCache | None = None) -> dict[str, str]:
+        """Solve every entered module that has no answer yet, in one pass."""
+        for module, state in self.states.items():
+            if state.text is not None:
+                continue
+            if cache is not None:
+                state.result, state.text = cache.lookup(module, state.inputs)
+            else:
+                descriptor = get_module(module)
+                state.result = descriptor.solve(*state.inputs)
+                state.text = descriptor.format(state.result)
+        return self.answers()
+
+    def answers(self) -> dict[str, str]:
+        return {module: state.text for module, state in self.states.items() if state.text is not None}
+
+    def invalidate(self, module: str):
+        """Forget the answer of a module so it is solved again, such as after its rules changed."""
+        state = self.states.get(module)
+        if state is not None:
+            state.result = state.text = None
+
+    def clear(self):
+        self.states.clear()
+
+    def pack(self) -> bytes:
+        """The inputs of the bomb in codec.STATE_BYTES bytes, answers are solved again on unpacking."""
+        return codec.pack({module: state.inputs for module, state in self.states.items()})
+
+    @classmethod
+    def unpack(cls, name: str, data: bytes) -> "Bomb":
+        bomb = cls(name)
+        for module, inputs in codec.unpack(data).items():
+            bomb.enter(module, inputs)
+        return bomb
+
+class Session:
+    """Every bomb an operator is juggling, with one of them active."""
+
+    __slots__ = ("bombs", "active", "created")
+
+    def __init__(self):
+        self.bombs: dict[str, Bomb] = {}
+        self.active: Bomb | None = None
+        self.created = 0
+
+    def __iter__(self) -> Iterator[Bomb]:
+        return iter(self.bombs.values())
+
+    def __len__(self) -> int:
+        return len(self.bombs)
+
+    def new_bomb(self, name: str | None = None) -> Bomb:
+        self.created += 1
+        if name is None:
+            name = f"Bomb {self.created}"
+        if name in self.bombs:
+            raise ValueError(f"There is already a bomb called '{name}'")
+        bomb = self.bombs[name] = Bomb(name)
+        self.active = bomb
+        return bomb
+
+    def switch(self, name: str) -> Bomb:
+        try:
+            self.active = self.bombs[name]
+        except KeyError:
+            raise ValueError(f"There is no bomb called '{name}'") from None
+        return self.active
+
+    def cycle(self, step: int = 1) -> Bomb:
+        if not self.bombs:
+            return self.new_bomb()
+        names = list(self.bombs)
+        index = names.index(self.active.name) if self.active is not None else -step
+        return self.switch(names[(index + step) % len(names)])
+
+    def remove(self, name: str):
+        bomb = self.bombs.pop(name)
+        if bomb is self.active:
+            self.active = next(iter(self.bombs.values()), None)
+
+    def invalidate(self, module: str):
+        for bomb in self.bombs.values():
+            bomb.invalidate(module)
+
+    def solve(self, cache: AnswerCache | None = None) -> dict[str, dict[str, str]]:
+        return {name: bomb.solve(cache) for name, bomb in self.bombs.items()}
@@ -0,0 +1,11 @@
+"""Percentiles of the timings the benchmarks, the service and the overlays report."""
+from collections.abc import Sequence
+from typing import TypeVar
+
+T = TypeVar("T")
+
+def percentile(ordered: Sequence[T], fraction: float, default: T | None = None) -> T | None:
+    """The value `fraction` of the way through an already sorted sequence, `default` when it is empty."""
+    if not ordered:
+        return default
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -0,0 +1,103 @@
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
+
+from solver import tables
+from solver.modules import get_module
+from solver.tables import TABLES
+
+class StreamStats:
+    def __init__(self):
+        self.records = 0
+        self.solved: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        lines = [f"{self.records:,} records in {self.seconds:.2f}s ({self.records_per_sec:,.0f} records/sec)"]
+        for module in sorted(self.solved.keys() | self.errors.keys()):
+            lines.append(f"  {module:<14} {self.solved.get(module, 0):>12,} solved {self.errors.get(module, 0):>10,} errors")
+        return "\n".join(lines)
+
+def read_records(lines: Iterable[str]) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Parse JSONL lazily, yielding (line number, record, parse error)."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield number, None, f"invalid JSON: {error}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "a record must be a JSON object"
+            continue
+        yield number, record, None
+
+def record_inputs(record: dict[str, Any], fields: tuple[str, ...]) -> tuple:
+    """The solver arguments of a record.
+
+    The inputs are either listed under "inputs", positionally or by field name, or
+    given as top level keys named after the module's fields.
+    """
+    inputs = record.get("inputs", record)
+    if isinstance(inputs, list):
+        return tuple(inputs)
+    return tuple(inputs[field] for field in fields)
+
+def solve_records(
+    records: Iterable[tuple[int, dict[str, Any] | None, str | None]],
+    stats: StreamStats
+) -> Iterator[dict[str, Any]]:
+    seen: set[str] = set()
+
+    for number, record, error in records:
+        stats.records += 1
+
+        if record is None:
+            stats.errors["<invalid>"] = stats.errors.get("<invalid>", 0) + 1
+            yield {"line": number, "error": error}
+            continue
+
+        name = record.get("module")
+        try:
+            module = get_module(name)
+            if name not in seen:
+                # A stream solves enough records that building the table pays off
+                seen.add(name)
+                if name in TABLES:
+                    tables.warm((name,))
+            answer = module.solve(*record_inputs(record, module.fields))
+        except (ValueError, KeyError, TypeError, IndexError) as error:
+            key = name if isinstance(name, str) else "<invalid>"
+            stats.errors[key] = stats.errors.get(key, 0) + 1
+            result = {"line": number, "module": name, "error": f"{type(error).__name__}: {error}"}
+        else:
+            stats.solved[name] = stats.solved.get(name, 0) + 1
+            result = {"line": number, "module": name, "answer": answer, "text": module.format(answer)}
+        if "id" in record:
+            result["id"] = record["id"]
+        yield result
+
+def solve_stream(source: TextIO, output: TextIO) -> StreamStats:
+    """Solve every record of a JSONL stream, writing one answer line per record as it goes."""
+    stats = StreamStats()
+    write = output.write
+    dumps = json.dumps
+
+    for result in solve_records(read_records(source), stats):
+        write(dumps(result))
+        write("\n")
+
+    stats.finished = time.perf_counter()
+    return stats
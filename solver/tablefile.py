@@ -0,0 +1,170 @@
+"""The built answer tables saved to one memory-mapped file."""
+import ast
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+from threading import Lock
+from types import CodeType, FunctionType
+from typing import Any
+
+from solver import ruledata, rules, tables
+
+"""ON THE SUBJECT OF THE ANSWER FILE
+
+The file is a header, a directory and then the codes of every table as 16 bit
+little endian integers:
+
+    magic, format, rules version (sha256), directory length, directory crc32
+    directory: repr of [(name, size, offset, crc32 of the codes, palette), ...]
+    codes
+
+The file is mapped rather than read, so a table's pages are only loaded once it
+is used. The codes of a table are checked against their crc32 on first use.
+"""
+MAGIC = b"DSAT"
+FORMAT = 1
+HEADER = struct.Struct("<4sH32sII")
+
+# Generated by `python -m solver tables` and bundled next to this module by build.bat
+DEFAULT_PATH = Path(__file__).with_name("answers.bin")
+
+def answers_path() -> Path:
+    """The bundled rules use the bundled file, a patched rule file gets its own next to it."""
+    path = Path(rules.RULE_FILE.path)
+    if path == Path(ruledata.DEFAULT_PATH):
+        return DEFAULT_PATH
+    return path.with_suffix(".answers.bin")
+
+def _hash_code(digest, code: CodeType):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+def rules_version() -> bytes:
+    """A digest of everything an answer depends on, so changing a rule makes old files stale."""
+    digest = hashlib.sha256(f"{FORMAT} {sys.byteorder} {sys.version_info[:2]}".encode())
+    # The rule file by its hash, its path differs between a checkout and a frozen build
+    digest.update(rules.RULE_FILE.digest.encode())
+    for module in (rules, tables):
+        for key, value in sorted(vars(module).items()):
+            if isinstance(value, FunctionType) and value.__module__ == module.__name__:
+                digest.update(key.encode())
+                _hash_code(digest, value.__code__)
+            elif key.isupper() and not key.startswith("_") and key not in ("TABLES", "RULE_FILE"):
+                digest.update(f"{key}={value!r}".encode())
+    for name, table in tables.TABLES.items():
+        digest.update(f"{name}:{table.size}:{table.rule.__name__}".encode())
+    return digest.digest()
+
+def write(path: Path | None = None, names: Sequence[str] | None = None) -> Path:
+    """Build the tables and write them to path, replacing it in one step."""
+    selected = [table for name, table in tables.TABLES.items() if names is None or name in names]
+    for table in selected:
+        table.build()
+
+    entries = []
+    offset = 0
+    for table in selected:
+        codes = _codes_bytes(table.codes)
+        entries.append((table.name, table.size, offset, zlib.crc32(codes), table.palette))
+        offset += len(codes)
+
+    # Offsets count from the end of the directory
+    directory = repr(entries).encode()
+    header = HEADER.pack(MAGIC, FORMAT, rules_version(), len(directory), zlib.crc32(directory))
+
+    path = Path(path) if path is not None else answers_path()
+    # Every writer has its own temporary file, the last one to finish replaces the file
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as file:
+        try:
+            file.write(header)
+            file.write(directory)
+            for table in selected:
+                file.write(_codes_bytes(table.codes))
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+    return path
+
+def _codes_bytes(codes: Sequence[int]) -> bytes:
+    if sys.byteorder != "little":
+        raise ValueError("Answer files are only written on little endian machines")
+    return bytes(memoryview(codes).cast("B"))
+
+class AnswerFile:
+    """A mapped answer file whose tables are handed to the AnswerTables on first use."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.entries = self._read_directory()
+        except ValueError:
+            self.map.close()
+            raise
+
+    def _read_directory(self) -> dict[str, tuple[int, int, int, list[Any]]]:
+        if len(self.map) < HEADER.size:
+            raise ValueError(f"{self.path} is too short to be an answer file")
+
+        magic, version, rules_digest, length, crc = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT:
+            raise ValueError(f"{self.path} is not an answer file of format {FORMAT}")
+        if rules_digest != rules_version():
+            raise ValueError(f"{self.path} was built from other rules")
+
+        directory = self.map[HEADER.size:HEADER.size + length]
+        if len(directory) != length or zlib.crc32(directory) != crc:
+            raise ValueError(f"The directory of {self.path} is damaged")
+
+        start = HEADER.size + length
+        entries = {}
+        for name, size, offset, codes_crc, palette in ast.literal_eval(directory.decode()):
+            if start + offset + 2 * size > len(self.map):
+                raise ValueError(f"{self.path} is cut short in the {name} table")
+            entries[name] = (start + offset, size, codes_crc, palette)
+        return entries
+
+    def table(self, name: str) -> tuple[list[Any], memoryview]:
+        offset, size, crc, palette = self.entries[name]
+        codes = memoryview(self.map)[offset:offset + 2 * size]
+        if zlib.crc32(codes) != crc:
+            raise ValueError(f"The {name} table of {self.path} is damaged")
+        return palette, codes.cast("H")
+
+_attached: AnswerFile | None = None
+# Workers that warm the tables at the same time map the file once
+_attach_lock = Lock()
+
+def attach(path: Path | None = None) -> bool:
+    """Point the AnswerTables at the answer file, returning False when it is missing or stale."""
+    global _attached
+    with _attach_lock:
+        if _attached is not None:
+            return True
+
+        try:
+            answers = AnswerFile(path if path is not None else answers_path())
+        except (OSError, ValueError, SyntaxError):
+            return False
+
+        for name in answers.entries:
+            table = tables.TABLES.get(name)
+            if table is not None and table.source is None:
+                table.source = lambda name=name: answers.table(name)
+        _attached = answers
+        return True
@@ -0,0 +1,284 @@
+from array import array
+from collections.abc import Callable, Collection, Sequence
+from threading import Lock
+from typing import Any
+
+from solver import rules
+
+class AnswerTable:
+    """Every answer of a module, enumerated once and looked up by input index.
+
+    `decode` turns an index back into the solver's arguments and `encode` does the
+    reverse, returning None for inputs outside the enumerated space. Those inputs
+    are handed to the rule function instead, so a table never disagrees with it.
+
+    Lookups also go to the rule until the table is built, so a one-off solve never
+    waits on an enumeration. Call `build` or `warm` to switch to the table.
+    `build` takes the answers from `source` when one is set, such as the mapped
+    answer file, and enumerates them when it fails.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        rule: Callable[..., Any],
+        encode: Callable[..., int | None],
+        decode: Callable[[int], tuple]
+    ):
+        self.name = name
+        self.size = size
+        self.rule = rule
+        self.encode = encode
+        self.decode = decode
+
+        # Answers are stored once in the palette, the codes index into it
+        self.palette: list[Any] = []
+        self.codes: Sequence[int] | None = None
+        self.source: Callable[[], tuple[list[Any], Sequence[int]]] | None = None
+        self._lock = Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.codes is not None
+
+    def build(self) -> "AnswerTable":
+        with self._lock:
+            if self.codes is None and self.source is not None:
+                try:
+                    self.load(*self.source())
+                except ValueError:
+                    self.source = None
+            if self.codes is None:
+                self.load(*self.enumerate())
+        return self
+
+    def enumerate(self) -> tuple[list[Any], array]:
+        palette: list[Any] = []
+        index: dict[Any, int] = {}
+        codes = array("H", bytes(2 * self.size))
+        rule = self.rule
+        decode = self.decode
+
+        for i in range(self.size):
+            answer = rule(*decode(i))
+            code = index.get(answer)
+            if code is None:
+                code = index[answer] = len(palette)
+                palette.append(answer)
+            codes[i] = code
+
+        return palette, codes
+
+    def load(self, palette: list[Any], codes: Sequence[int]):
+        if len(codes) != self.size:
+            raise ValueError(f"The {self.name} table needs {self.size} entries, got {len(codes)}")
+        self.palette = palette
+        self.codes = codes
+
+    def swap(self, palette: list[Any], codes: Sequence[int]):
+        """Replace the answers after the rules are reloaded, from the thread that looks them up."""
+        with self._lock:
+            self.load(palette, codes)
+            # The answer file holds the old rules
+            self.source = None
+
+    def lookup(self, *args: Any) -> Any:
+        codes = self.codes
+        if codes is None:
+            return self.rule(*args)
+        i = self.encode(*args)
+        if i is None:
+            return self.rule(*args)
+        return self.palette[codes[i]]
+
+    def __call__(self, *args: Any) -> Any:
+        return self.lookup(*args)
+
+    def items(self):
+        if self.codes is None:
+            self.build()
+        for i, code in enumerate(self.codes):
+            yield self.decode(i), self.palette[code]
+
+"""ON THE SUBJECT OF THE WIRES"""
+# None is the "No light" prompt of the select
+WIRE_LIGHT_INDEX = {light: i for i, light in enumerate((None, *rules.WIRE_LIGHTS))}
+WIRE_LIGHT_STATES = len(WIRE_LIGHT_INDEX)
+
+def encode_wires(selected: Collection[int], light: str | None) -> int | None:
+    mask = 0
+    for i in selected:
+        if type(i) is not int or not 0 <= i < len(rules.WIRE_COLORS) or mask >> i & 1:
+            return None
+        mask |= 1 << i
+
+    light_index = WIRE_LIGHT_INDEX.get(light)
+    if light_index is None:
+        return None
+
+    return mask * WIRE_LIGHT_STATES + light_index
+
+def decode_wires(index: int) -> tuple:
+    mask, light_index = divmod(index, WIRE_LIGHT_STATES)
+    selected = tuple(i for i in range(len(rules.WIRE_COLORS)) if mask >> i & 1)
+    return selected, (None, *rules.WIRE_LIGHTS)[light_index]
+
+"""ON THE SUBJECT OF THE BUTTON"""
+BUTTON_COLOR_INDEX = {color: i for i, color in enumerate((None, *rules.BUTTON_COLORS))}
+BUTTON_TEXT_INDEX = {text: i for i, text in enumerate((None, *rules.BUTTON_TEXTS))}
+
+def encode_button(color: str | None, text: str | None) -> int | None:
+    color_index = BUTTON_COLOR_INDEX.get(color)
+    text_index = BUTTON_TEXT_INDEX.get(text)
+    if color_index is None or text_index is None:
+        return None
+    return color_index * len(BUTTON_TEXT_INDEX) + text_index
+
+def decode_button(index: int) -> tuple:
+    color_index, text_index = divmod(index, len(BUTTON_TEXT_INDEX))
+    return (None, *rules.BUTTON_COLORS)[color_index], (None, *rules.BUTTON_TEXTS)[text_index]
+
+"""ON THE SUBJECT OF THE TILES"""
+TILE_STATES = (None, *rules.TILE_VALUES)
+TILE_INDEX = {color: i for i, color in enumerate(TILE_STATES)}
+
+def encode_tiles(left: str | None, right: str | None) -> int | None:
+    left_index = TILE_INDEX.get(left)
+    right_index = TILE_INDEX.get(right)
+    if left_index is None or right_index is None:
+        return None
+    return left_index * len(TILE_STATES) + right_index
+
+def decode_tiles(index: int) -> tuple:
+    left_index, right_index = divmod(index, len(TILE_STATES))
+    return TILE_STATES[left_index], TILE_STATES[right_index]
+
+"""ON THE SUBJECT OF BINARY"""
+# Switch binary-1 is the lowest bit
+BINARY_SWITCHES = rules.BINARY_SWITCHES
+
+def encode_binary(switches: Sequence[bool]) -> int | None:
+    if len(switches) != BINARY_SWITCHES:
+        return None
+
+    mask = 0
+    for i, value in enumerate(switches):
+        if value is True:
+            mask |= 1 << i
+        elif value is not False:
+            return None
+    return mask
+
+def decode_binary(index: int) -> tuple:
+    return (tuple(bool(index >> i & 1) for i in range(BINARY_SWITCHES)),)
+
+"""ON THE SUBJECT OF MATHEMATICS"""
+MATHEMATICS_LETTERS = "".join(rules.MATHEMATICS_DIGITS)
+MATHEMATICS_INDEX = {ch: i for i, ch in enumerate(MATHEMATICS_LETTERS)}
+
+def encode_mathematics(raw: str) -> int | None:
+    if len(raw) != 5 or raw[2] != "-":
+        return None
+
+    index = 0
+    for ch in raw[:2] + raw[3:]:
+        letter_index = MATHEMATICS_INDEX.get(ch)
+        if letter_index is None:
+            return None
+        index = index * len(MATHEMATICS_LETTERS) + letter_index
+    return index
+
+def decode_mathematics(index: int) -> tuple:
+    base = len(MATHEMATICS_LETTERS)
+    letters = [MATHEMATICS_LETTERS[index // base ** p % base] for p in (3, 2, 1, 0)]
+    return (f"{letters[0]}{letters[1]}-{letters[2]}{letters[3]}",)
+
+"""ON THE SUBJECT OF COLOR CODE"""
+COLOR_CODE_LETTERS = "".join(rules.COLOR_CODE_LETTERS)
+COLOR_CODE_LETTER_INDEX = {ch: i for i, ch in enumerate(COLOR_CODE_LETTERS)}
+COLOR_CODE_COLORS = tuple(rules.COLOR_CODE_COLORS)
+
+def encode_color_code(colors: Sequence[str | None], letters: str) -> int | None:
+    # The colors only have to be picked, so the table is keyed on the letters
+    if len(colors) != 5 or any(color not in rules.COLOR_CODE_COLORS for color in colors):
+        return None
+    if any(rules.COLOR_CODE_COLORS[color] != 0 for color in colors):
+        return None
+    if len(letters) != 5:
+        return None
+
+    index = 0
+    for ch in letters:
+        letter_index = COLOR_CODE_LETTER_INDEX.get(ch)
+        if letter_index is None:
+            return None
+        index = index * len(COLOR_CODE_LETTERS) + letter_index
+    return index
+
+def decode_color_code(index: int) -> tuple:
+    base = len(COLOR_CODE_LETTERS)
+    letters = "".join(COLOR_CODE_LETTERS[index // base ** p % base] for p in (4, 3, 2, 1, 0))
+    return (COLOR_CODE_COLORS[0],) * 5, letters
+
+"""ON THE SUBJECT OF MULTI BUTTONS"""
+def encode_multi_buttons(raw: str) -> int | None:
+    if len(raw) != 6 or not raw.isascii() or not raw.isdigit():
+        return None
+    return int(raw)
+
+def decode_multi_buttons(index: int) -> tuple:
+    return (f"{index:06d}",)
+
+"""ON THE SUBJECT OF TIMING"""
+TIMING_LETTERS = "".join(rules.TIMING_VALUES)
+TIMING_LETTER_INDEX = {ch: i for i, ch in enumerate(TIMING_LETTERS)}
+
+def encode_timing(raw: str) -> int | None:
+    if len(raw) != 5 or raw[2] != "-" or not raw[:2].isascii() or not raw[:2].isdigit():
+        return None
+
+    first = TIMING_LETTER_INDEX.get(raw[3])
+    second = TIMING_LETTER_INDEX.get(raw[4])
+    if first is None or second is None:
+        return None
+
+    return (int(raw[:2]) * len(TIMING_LETTERS) + first) * len(TIMING_LETTERS) + second
+
+def decode_timing(index: int) -> tuple:
+    rest, second = divmod(index, len(TIMING_LETTERS))
+    number, first = divmod(rest, len(TIMING_LETTERS))
+    return (f"{number:02d}-{TIMING_LETTERS[first]}{TIMING_LETTERS[second]}",)
+
+TABLES: dict[str, AnswerTable] = {
+    table.name: table for table in [
+        AnswerTable("wires", 2 ** len(rules.WIRE_COLORS) * WIRE_LIGHT_STATES, rules.wires, encode_wires, decode_wires),
+        AnswerTable("button", len(BUTTON_COLOR_INDEX) * len(BUTTON_TEXT_INDEX), rules.button, encode_button, decode_button),
+        AnswerTable("tiles", len(TILE_STATES) ** 2, rules.tiles, encode_tiles, decode_tiles),
+        AnswerTable("binary", 2 ** BINARY_SWITCHES, rules.binary, encode_binary, decode_binary),
+        AnswerTable("mathematics", len(MATHEMATICS_LETTERS) ** 4, rules.mathematics, encode_mathematics, decode_mathematics),
+        AnswerTable("color-code", len(COLOR_CODE_LETTERS) ** 5, rules.color_code, encode_color_code, decode_color_code),
+        AnswerTable("multi-buttons", 10 ** 6, rules.multi_buttons, encode_multi_buttons, decode_multi_buttons),
+        AnswerTable("timing", 100 * len(TIMING_LETTERS) ** 2, rules.timing, encode_timing, decode_timing),
+    ]
+}
+
+def warm(names: Collection[str] | None = None):
+    """Build the tables up front, for example from a worker thread at startup.
+
+    The tables are mapped from the answer file when it is current. A missing or
+    stale file is written again once every table has been enumerated.
+    """
+    from solver import tablefile
+
+    current = tablefile.attach()
+    for name, table in TABLES.items():
+        if names is None or name in names:
+            table.build()
+
+    if not current and names is None:
+        try:
+            tablefile.write()
+        except (OSError, ValueError):
+            # A read-only install keeps enumerating at startup
+            pass
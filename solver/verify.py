@@ -0,0 +1,201 @@
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Any, NamedTuple
+
+from solver import code_engine, keypad_engine, rules
+from solver.arrays import numpy
+from solver.tables import TABLES
+
+class Divergence(NamedTuple):
+    module: str
+    engine: str
+    inputs: tuple
+    expected: Any
+    actual: Any
+
+class ShardResult(NamedTuple):
+    module: str
+    checked: int
+    divergences: list[Divergence]
+    # More divergences than the shard reported
+    truncated: int
+
+class Report:
+    def __init__(self):
+        self.checked: dict[str, int] = {}
+        self.divergences: dict[str, list[Divergence]] = {}
+        self.diverged: dict[str, int] = {}
+        self.seconds = 0.0
+
+    def add(self, result: ShardResult, limit: int):
+        self.checked[result.module] = self.checked.get(result.module, 0) + result.checked
+        self.diverged[result.module] = self.diverged.get(result.module, 0) + len(result.divergences) + result.truncated
+        kept = self.divergences.setdefault(result.module, [])
+        kept.extend(result.divergences[:max(0, limit - len(kept))])
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.diverged.values())
+
+    def summary(self) -> str:
+        lines = []
+        for module, checked in self.checked.items():
+            lines.append(f"{module:<14} {checked:>12,} inputs checked {self.diverged.get(module, 0):>10,} diverging")
+            for divergence in self.divergences.get(module, []):
+                lines.append(
+                    f"  {divergence.engine}: {divergence.inputs!r} rule gave {divergence.expected!r}, "
+                    f"engine gave {divergence.actual!r}"
+                )
+        lines.append(f"Checked in {self.seconds:.2f}s")
+        return "\n".join(lines)
+
+def check_table_shard(name: str, start: int, palette: list[Any], codes: list[int], limit: int) -> ShardResult:
+    """Compare a slice of a built table against the rule, and check the index encoding round trips."""
+    table = TABLES[name]
+    rule = table.rule
+    divergences: list[Divergence] = []
+    found = 0
+
+    inputs = [table.decode(start + offset) for offset in range(len(codes))]
+    # The typed modules are also solved by the batch engine, in one go
+    batched = code_engine.solve_records(name, inputs) if name in code_engine.ENGINES else None
+
+    for offset, (code, args) in enumerate(zip(codes, inputs)):
+        i = start + offset
+        expected = rule(*args)
+        actual = palette[code]
+        problem = None
+        if table.encode(*args) != i:
+            problem = Divergence(name, "encode", args, i, table.encode(*args))
+        elif expected != actual:
+            problem = Divergence(name, "table", args, expected, actual)
+        elif batched is not None and batched[offset] != expected:
+            problem = Divergence(name, "batch", args, expected, batched[offset])
+        if problem is not None:
+            found += 1
+            if len(divergences) < limit:
+                divergences.append(problem)
+
+    return ShardResult(name, len(codes), divergences, found - len(divergences))
+
+def check_keypads_shard(start: int, stop: int, limit: int) -> ShardResult:
+    """Compare both keypads engines against the rule over a slice of the 100^4 space."""
+    tl, tr, bl, br = keypad_engine.decode_space(start, stop)
+    orders = keypad_engine.orders(tl, tr, bl, br).tolist()
+    divergences: list[Divergence] = []
+    found = 0
+
+    for values in zip(tl.tolist(), tr.tolist(), bl.tolist(), br.tolist(), orders):
+        args = tuple(str(value) for value in values[:4])
+        expected = rules.keypads(*args)
+        for engine, actual in (
+            ("vector", rules.KEYPAD_ORDERS[values[4]]),
+            ("scalar", keypad_engine.solve(*args)),
+        ):
+            if actual != expected:
+                found += 1
+                if len(divergences) < limit:
+                    divergences.append(Divergence("keypads", engine, args, expected, actual))
+
+    return ShardResult("keypads", stop - start, divergences, found - len(divergences))
+
+# Characters the fuzzed codes are drawn from, the valid ones and those the rules parse loosely
+FUZZ_ALPHABET = b"0123456789ABCDEFGHIJQRWYabcdefx-+_ \0\xb2\xe9"
+
+def check_codes_shard(name: str, seed: int, count: int, limit: int) -> ShardResult:
+    """Compare the batch engine against the rule over random codes of the module's width and either side of it."""
+    np = numpy()
+    rng = np.random.default_rng(seed)
+    alphabet = np.frombuffer(FUZZ_ALPHABET, dtype=np.uint8)
+    rule = getattr(rules, name.replace("-", "_"))
+    divergences: list[Divergence] = []
+    found = 0
+
+    for width in range(code_engine.WIDTHS[name] - 1, code_engine.WIDTHS[name] + 2):
+        matrix = alphabet[rng.integers(0, len(alphabet), (count // 3, width))]
+        # Half of the codes get their dashes where the mask puts them
+        dashes = [i for i in (2, 5, 8) if i < width] if name == "hexadecimal" else [2]
+        if name != "multi-buttons":
+            matrix[::2, dashes] = ord("-")
+        codes = matrix.view(f"S{width}").ravel()
+
+        if name == "color-code":
+            # Some lines are left unpicked
+            colors = rng.integers(-1, len(rules.COLOR_CODE_COLORS), (len(codes), 5))
+            batch = code_engine.color_code(codes, colors)
+            names = (None, *rules.COLOR_CODE_COLORS)
+            inputs = [(tuple(names[i + 1] for i in row), code) for row, code in zip(colors.tolist(), codes.tolist())]
+        else:
+            batch = code_engine.ENGINES[name](codes)
+            inputs = [(code,) for code in codes.tolist()]
+
+        for (*picked, code), actual in zip(inputs, batch.answers()):
+            args = (*picked, code.decode("latin-1"))
+            expected = rule(*args)
+            if expected != actual:
+                found += 1
+                if len(divergences) < limit:
+                    divergences.append(Divergence(name, "batch", args, expected, actual))
+
+    return ShardResult(name, count // 3 * 3, divergences, found - len(divergences))
+
+def _shards(size: int, shard_size: int) -> Iterable[tuple[int, int]]:
+    for start in range(0, size, shard_size):
+        yield start, min(start + shard_size, size)
+
+def verify(
+    modules: Iterable[str] | None = None,
+    workers: int | None = None,
+    shard_size: int = 100_000,
+    keypads_limit: int = keypad_engine.SPACE_SIZE,
+    limit: int = 20,
+    executor: Executor | None = None,
+    fuzz: int = 300_000
+) -> Report:
+    """Check every optimized engine against the rules, spreading the shards over a process pool.
+
+    Only the first `limit` diverging inputs of each module are kept. `keypads_limit`
+    bounds how much of the 100^4 keypads space is covered. The batch engine of the
+    typed modules is also checked over `fuzz` random codes each.
+    """
+    names = list(modules) if modules is not None else [*TABLES, "keypads", "hexadecimal"]
+    report = Report()
+    started = time.perf_counter()
+    owned = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+    try:
+        futures = []
+        for name in names:
+            report.checked[name] = 0
+            if name in code_engine.ENGINES:
+                for seed, (start, stop) in enumerate(_shards(fuzz, shard_size)):
+                    futures.append(executor.submit(check_codes_shard, name, seed, stop - start, limit))
+            if name == "keypads":
+                for start, stop in _shards(min(keypads_limit, keypad_engine.SPACE_SIZE), shard_size):
+                    futures.append(executor.submit(check_keypads_shard, start, stop, limit))
+                continue
+
+            table = TABLES.get(name)
+            if table is None and name in code_engine.ENGINES:
+                continue
+            if table is None:
+                raise ValueError(f"There is no optimized engine for '{name}' to verify")
+            table.build()
+            for start, stop in _shards(table.size, shard_size):
+                # Each worker only gets its own slice of the codes
+                futures.append(executor.submit(
+                    check_table_shard, name, start, table.palette, list(table.codes[start:stop]), limit
+                ))
+
+        for future in as_completed(futures):
+            report.add(future.result(), limit)
+    finally:
+        if owned:
+            executor.shutdown(cancel_futures=True)
+
+    report.seconds = time.perf_counter() - started
+    return report
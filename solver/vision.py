@@ -0,0 +1,174 @@
+"""Reading the inputs of a module off a screenshot of its face."""
+import re
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from solver import rules
+from solver.arrays import numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+"""ON THE SUBJECT OF SCREENSHOTS
+
+A screenshot is a snip of one module's face. Every pixel is quantized to the
+nearest color the modules use through a lookup table over 5 bit channels, so a
+whole frame is classified by a few NumPy operations. The colors of each part of
+the module are then counted over fixed boxes of the face.
+"""
+# The reference colors, the Roblox brick colors the modules are built from
+COLORS: dict[str, tuple[int, int, int]] = {
+    "White": (242, 243, 243),
+    "Red": (196, 40, 28),
+    "Yellow": (245, 205, 48),
+    "Green": (75, 151, 75),
+    "Blue": (13, 105, 172),
+    "Orange": (218, 133, 65),
+    "Pink": (255, 102, 204),
+    "Grey": (163, 162, 165),
+    # The casing, so dark pixels are not taken for a dark blue
+    "Black": (27, 42, 53),
+}
+COLOR_NAMES = tuple(COLORS)
+
+# Pixels further than this from every reference color are background
+MAX_DISTANCE = 90
+BACKGROUND = len(COLORS)
+
+# Bits kept per channel, the lookup table has an entry per bin
+BITS = 5
+SHIFT = 8 - BITS
+
+# The nearest color of every bin, built the first time a screenshot is read
+@cache
+def _table() -> "np.ndarray":
+    np = numpy()
+    centers = (np.arange(1 << BITS, dtype=np.int32) << SHIFT) + (1 << SHIFT >> 1)
+    bins = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 1, 3)
+    references = np.array(list(COLORS.values()), dtype=np.int32)
+    distances = ((bins - references) ** 2).sum(axis=-1)
+
+    nearest = distances.argmin(axis=1).astype(np.uint8)
+    nearest[distances.min(axis=1) > MAX_DISTANCE ** 2] = BACKGROUND
+    return nearest
+
+def quantize(image) -> "np.ndarray":
+    """The index into COLORS of every pixel of an RGB or RGBA image, BACKGROUND for the rest."""
+    np = numpy()
+    lut = _table()
+    pixels = np.asarray(image)
+    if pixels.dtype != np.uint8 or pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+        raise ValueError(f"Expected an 8 bit RGB or RGBA image, got {pixels.dtype} {pixels.shape}")
+
+    # The bin of each pixel is built in place, red being the most significant
+    index = pixels[..., 0].astype(np.uint16)
+    index >>= SHIFT
+    index <<= BITS
+    channel = pixels[..., 1] >> SHIFT
+    index |= channel
+    index <<= BITS
+    np.right_shift(pixels[..., 2], SHIFT, out=channel)
+    index |= channel
+    return lut.take(index)
+
+class Box(NamedTuple):
+    """Part of the module face, as fractions of the snip's width and height."""
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+    def slices(self, height: int, width: int) -> tuple[slice, slice]:
+        return (
+            slice(int(self.top * height), max(int(self.top * height) + 1, int(self.bottom * height))),
+            slice(int(self.left * width), max(int(self.left * width) + 1, int(self.right * width))),
+        )
+
+class Frame:
+    """A quantized screenshot, counted box by box."""
+
+    def __init__(self, image):
+        self.codes = quantize(image)
+
+    def shares(self, box: Box) -> dict[str, float]:
+        np = numpy()
+        region = self.codes[box.slices(*self.codes.shape)]
+        counts = np.bincount(region.ravel(), minlength=BACKGROUND + 1)
+        return {name: count / region.size for name, count in zip(COLOR_NAMES, counts.tolist())}
+
+    def dominant(self, box: Box, choices: tuple[str, ...], share: float = 0.25) -> str | None:
+        """The choice covering most of the box, None when none covers `share` of it."""
+        shares = self.shares(box)
+        best = max(choices, key=lambda name: shares.get(name, 0.0))
+        return best if shares.get(best, 0.0) >= share else None
+
+"""ON THE SUBJECT OF THE MODULES"""
+# The wires hang below the light
+WIRES_BOX = Box(0.1, 0.3, 0.9, 0.95)
+LIGHT_BOX = Box(0.35, 0.03, 0.65, 0.22)
+# A wire counts as present when its color covers this much of the wires box
+WIRE_SHARE = 0.02
+
+TILE_BOXES = (Box(0.08, 0.15, 0.45, 0.85), Box(0.55, 0.15, 0.92, 0.85))
+
+# The five lines sit side by side above the letters
+COLOR_CODE_BOXES = tuple(Box(0.05 + i * 0.18, 0.08, 0.05 + i * 0.18 + 0.14, 0.55) for i in range(5))
+
+def _wires(frame: Frame) -> dict[int, Any]:
+    shares = frame.shares(WIRES_BOX)
+    selected = tuple(i for i, color in enumerate(rules.WIRE_COLORS) if shares[color] >= WIRE_SHARE)
+    return {0: selected, 1: frame.dominant(LIGHT_BOX, rules.WIRE_LIGHTS)}
+
+def _tiles(frame: Frame) -> dict[int, Any]:
+    colors = tuple(rules.TILE_VALUES)
+    return {0: frame.dominant(TILE_BOXES[0], colors), 1: frame.dominant(TILE_BOXES[1], colors)}
+
+def _color_code(frame: Frame) -> dict[int, Any]:
+    colors = tuple(rules.COLOR_CODE_COLORS)
+    # The letters are typed in
+    return {0: tuple(frame.dominant(box, colors) for box in COLOR_CODE_BOXES)}
+
+# The arguments each module's screenshot fills in, by position
+READERS: dict[str, Callable[[Frame], dict[int, Any]]] = {
+    "wires": _wires,
+    "tiles": _tiles,
+    "color-code": _color_code,
+}
+
+def read(name: str, image) -> dict[int, Any]:
+    reader = READERS.get(name)
+    if reader is None:
+        raise ValueError(f"A screenshot can fill in {', '.join(READERS)}, not {name}")
+    return reader(Frame(image))
+
+"""ON THE SUBJECT OF IMAGE FILES"""
+PPM_HEADER = re.compile(rb"P6\s+(\d+)\s+(\d+)\s+(\d+)\s")
+
+def load_image(path: Path) -> "np.ndarray":
+    """Read a screenshot as an RGB array. PPM and .npy are read directly, other formats need Pillow."""
+    np = numpy()
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".npy":
+        return np.load(path)
+
+    if suffix in (".ppm", ".pnm"):
+        data = path.read_bytes()
+        header = PPM_HEADER.match(data)
+        if header is None or header[3] != b"255":
+            raise ValueError(f"{path} is not an 8 bit binary PPM")
+        width, height = int(header[1]), int(header[2])
+        if len(data) - header.end() < width * height * 3:
+            raise ValueError(f"{path} is truncated")
+        # A view of the file's bytes, not a copy
+        return np.frombuffer(data, np.uint8, width * height * 3, header.end()).reshape(height, width, 3)
+
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ValueError(f"Reading {suffix or 'these'} files needs Pillow (pip install pillow), or save the snip as PPM") from None
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
@@ -0,0 +1,8 @@
+from solver import solve_many
+from solver.arrays import BATCH_THRESHOLD
+from solver.modules import get_module
+
+def test_keypads_batch_matches_the_rule_for_huge_values():
+    records = [("1", "2", "3", "4")] * BATCH_THRESHOLD + [("99999999999999999999", "1", "1", "1"), ("x", "1", "1", "1")]
+    solve = get_module("keypads").solve
+    assert solve_many("keypads", records) == [solve(*record) for record in records]
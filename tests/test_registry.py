@@ -0,0 +1,31 @@
+import asyncio
+
+from textual.app import App, ComposeResult
+from textual.widgets import RadioButton, RadioSet
+
+from tui.registry import RESETTERS, WRITERS
+
+class RadioApp(App):
+    def compose(self) -> ComposeResult:
+        yield RadioSet(RadioButton("Red"), RadioButton("Blue"))
+
+def test_reset_leaves_no_radio_button_pressed():
+    async def run():
+        app = RadioApp()
+        async with app.run_test() as pilot:
+            radio_set = app.query_one(RadioSet)
+            WRITERS[RadioSet](radio_set, "Blue")
+            await pilot.pause()
+            assert str(radio_set.pressed_button.label) == "Blue"
+
+            RESETTERS[RadioSet](radio_set)
+            await pilot.pause()
+            assert radio_set.pressed_button is None
+            assert not any(button.value for button in radio_set.query(RadioButton))
+
+            # The set still presses buttons after forgetting the last one
+            WRITERS[RadioSet](radio_set, "Red")
+            await pilot.pause()
+            assert str(radio_set.pressed_button.label) == "Red"
+
+    asyncio.run(run())
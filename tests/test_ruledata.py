@@ -0,0 +1,15 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from solver import ruledata
+
+def test_binary_switch_count_is_fixed(tmp_path):
+    data = json.loads(Path(ruledata.DEFAULT_PATH).read_text())
+    data["binary"]["switches"] = 8
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError, match="the binary rules are invalid"):
+        ruledata.compile_rules(ruledata.load(path), ["binary"])
@@ -0,0 +1,30 @@
+import io
+import json
+
+from solver.stream import solve_stream
+
+def run(*records) -> list[dict]:
+    source = io.StringIO("".join(f"{json.dumps(record)}\n" for record in records))
+    output = io.StringIO()
+    solve_stream(source, output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_oversized_hexadecimal_part_is_invalid():
+    [result] = run({"module": "hexadecimal", "inputs": ["10000000000-41-41-41"]})
+    assert result["answer"] is None
+
+def test_bad_records_do_not_stop_the_stream():
+    results = run(
+        {"module": "hexadecimal", "inputs": ["10000000000-41-41-41"]},
+        {"module": "nonexistent", "inputs": []},
+        {"module": "hexadecimal", "inputs": ["48-65-6C-6C"], "id": 3},
+        {"module": "tiles", "left": "Red", "right": "Green"},
+    )
+    assert [result["line"] for result in results] == [1, 2, 3, 4]
+    assert "error" in results[1]
+    assert results[2]["answer"] == "Hell" and results[2]["id"] == 3
+    assert results[3]["answer"] is not None
+
+def test_errors_echo_the_record_id():
+    [result] = run({"id": "a1", "module": "tiles", "left": "Purple", "right": "Red"})
+    assert "error" in result and result["id"] == "a1"
@@ -0,0 +1,79 @@
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Static
+
+from tui.perf import STAGES, PerfMonitor
+from tui.render import RenderStats
+
+class PerfOverlay(ModalScreen):
+    """The p50, p95 and max of every timed stage for each module, refreshed while it is open."""
+
+    CSS = """
+    PerfOverlay {
+        align: center middle;
+    }
+
+    #perf-frame {
+        width: auto;
+        height: auto;
+        max-height: 90%;
+        padding: 1 2;
+        border: round $primary;
+        background: $surface;
+    }
+
+    #perf-render, #perf-help {
+        padding-top: 1;
+    }
+    """
+
+    BINDINGS = [
+        Binding('ctrl+t', 'close', 'Close'),
+        Binding('escape', 'close', 'Close', show=False)
+    ]
+
+    def __init__(self, monitor: PerfMonitor, render: RenderStats | None = None):
+        super().__init__()
+        self.monitor = monitor
+        self.render_stats = render
+
+    def compose(self) -> ComposeResult:
+        with Container(id="perf-frame"):
+            yield DataTable(id="perf-table", cursor_type="none", zebra_stripes=True)
+            yield Static(id="perf-render")
+            yield Static("Times are in milliseconds, latency is from the first event to the repaint", id="perf-help")
+
+    def on_mount(self) -> None:
+        self.query_one("#perf-frame").border_title = "Performance"
+        table = self.query_one("#perf-table")
+        table.add_columns("Module", "Stage", "Count", "p50", "p95", "Max")
+        self.refresh_table()
+        self.set_interval(0.5, self.refresh_table)
+
+    def refresh_table(self):
+        stats = self.render_stats
+        if stats is not None:
+            self.query_one("#perf-render", Static).update(
+                f"Answer labels: {stats.updates} updates in {stats.batches} refreshes, "
+                f"{stats.unchanged} unchanged and {stats.replaced} replaced texts skipped, "
+                f"{stats.avoided} repaints avoided"
+            )
+
+        table = self.query_one("#perf-table")
+        table.clear()
+        for module, stages in self.monitor.summary().items():
+            for stage in STAGES:
+                summary = stages[stage]
+                table.add_row(
+                    module if stage == STAGES[0] else "",
+                    stage,
+                    str(summary["count"]),
+                    f"{summary['p50'] * 1000:.3f}",
+                    f"{summary['p95'] * 1000:.3f}",
+                    f"{summary['max'] * 1000:.3f}",
+                )
+
+    def action_close(self):
+        self.dismiss()
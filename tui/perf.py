@@ -0,0 +1,68 @@
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from solver.stats import percentile
+
+# What is timed for every module, in the order the overlay shows them
+STAGES = ("handler", "solve", "update", "latency")
+
+class RollingHistogram:
+    """The most recent timings of one stage, in seconds."""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, window: int):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, *fractions: float) -> list[float]:
+        ordered = sorted(self.samples)
+        return [percentile(ordered, fraction, 0.0) for fraction in fractions]
+
+    def summary(self) -> dict[str, float | int]:
+        p50, p95 = self.percentiles(0.50, 0.95)
+        return {"count": self.count, "p50": p50, "p95": p95, "max": max(self.samples, default=0.0)}
+
+class PerfMonitor:
+    """Rolling histograms of each stage of turning an input event into a repainted answer.
+
+    handler is the time spent in the input event handler, solve the time to work
+    out the answer text, update the `Label.update` call and latency the time from
+    the first event that dirtied a module to the refresh that showed its answer.
+    """
+
+    def __init__(self, window: int = 512):
+        self.window = window
+        self.histograms: dict[str, dict[str, RollingHistogram]] = {}
+
+    def histogram(self, module: str, stage: str) -> RollingHistogram:
+        stages = self.histograms.get(module)
+        if stages is None:
+            stages = self.histograms[module] = {name: RollingHistogram(self.window) for name in STAGES}
+        return stages[stage]
+
+    def record(self, module: str, stage: str, seconds: float):
+        self.histogram(module, stage).add(seconds)
+
+    def since(self, module: str, stage: str, started: float):
+        self.record(module, stage, time.perf_counter() - started)
+
+    @contextmanager
+    def timer(self, module: str, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.since(module, stage, started)
+
+    def summary(self) -> dict[str, dict[str, dict[str, float | int]]]:
+        return {
+            module: {stage: histogram.summary() for stage, histogram in stages.items()}
+            for module, stages in self.histograms.items()
+        }
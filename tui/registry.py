@@ -0,0 +1,157 @@
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, NamedTuple
+
+from textual.dom import DOMNode
+from textual.widget import Widget
+from textual.widgets import Input, RadioButton, RadioSet, Select, SelectionList, Switch
+
+import solver
+
+class ModuleView(NamedTuple):
+    """How a module is laid out on the main menu screen."""
+    name: str
+    # The widget ids for each argument of the solver, a tuple of ids is passed as one tuple
+    args: tuple[str | tuple[str, ...], ...]
+    # Border titles applied to widgets of the tab
+    titles: dict[str, str] = {}
+    # Inputs that reset leaves as they are
+    keep: tuple[str, ...] = ()
+
+    @property
+    def answer(self) -> str:
+        return f"{self.name}-answer"
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        ids: list[str] = []
+        for arg in self.args:
+            ids.extend(arg if isinstance(arg, tuple) else (arg,))
+        return tuple(ids)
+
+def _read_radio_set(radio_set: RadioSet) -> str | None:
+    pressed = radio_set.pressed_button
+    return str(pressed.label) if pressed is not None else None
+
+def _unpress_radio_set(radio_set: RadioSet):
+    """Switch off the pressed button of a radio set, leaving none pressed.
+
+    Textual 3.5 (pinned in requirements.txt) has no public way to do this: a radio
+    set presses a button switched off by hand again, and only forgets it through its
+    private `_pressed_button`. tests/test_registry.py fails if an upgrade changes that.
+    """
+    pressed = radio_set.pressed_button
+    if pressed is None:
+        return
+    with radio_set.prevent(RadioButton.Changed):
+        pressed.value = False
+    radio_set._pressed_button = None
+
+def _reset_switch(switch: Switch):
+    switch.value = False
+
+def _write_selection_list(selection_list: SelectionList, selected: tuple):
+    selection_list.deselect_all()
+    for value in selected:
+        selection_list.select(value)
+
+def _write_select(select: Select, value: Any):
+    if value is None:
+        select.clear()
+    else:
+        select.value = value
+
+def _write_radio_set(radio_set: RadioSet, label: str | None):
+    if label is None:
+        _unpress_radio_set(radio_set)
+        return
+    for button in radio_set.query(RadioButton):
+        if str(button.label) == label:
+            button.value = True
+            return
+
+def _write_value(widget: Input | Switch, value: Any):
+    widget.value = value
+
+# How the value of each kind of input widget is read and cleared
+READERS: dict[type, Callable[[Any], Hashable]] = {
+    SelectionList: lambda widget: tuple(sorted(widget.selected)),
+    Select: lambda widget: widget.selection,
+    Input: lambda widget: widget.value,
+    Switch: lambda widget: widget.value,
+    RadioSet: _read_radio_set,
+}
+
+RESETTERS: dict[type, Callable[[Any], Any]] = {
+    SelectionList: lambda widget: widget.deselect_all(),
+    Select: lambda widget: widget.clear(),
+    Input: lambda widget: widget.clear(),
+    Switch: _reset_switch,
+    RadioSet: _unpress_radio_set,
+}
+
+# The inverse of the readers, putting a stored value back into a widget
+WRITERS: dict[type, Callable[[Any, Any], Any]] = {
+    SelectionList: _write_selection_list,
+    Select: _write_select,
+    Input: _write_value,
+    Switch: _write_value,
+    RadioSet: _write_radio_set,
+}
+
+def _by_type(table: dict[type, Callable], widget: Widget) -> Callable:
+    for widget_type, function in table.items():
+        if isinstance(widget, widget_type):
+            return function
+    raise TypeError(f"There is no reader for #{widget.id} ({type(widget).__name__})")
+
+class BoundModule:
+    """A module view with its widgets looked up once."""
+
+    def __init__(self, view: ModuleView, root: DOMNode):
+        self.view = view
+        self.module: solver.Module = solver.get_module(view.name)
+        self.answer = root.query_one(f"#{view.answer}")
+        self.widgets: dict[str, Widget] = {widget_id: root.query_one(f"#{widget_id}") for widget_id in view.inputs}
+
+        self._readers = {widget_id: _by_type(READERS, widget) for widget_id, widget in self.widgets.items()}
+        self._writers = {widget_id: _by_type(WRITERS, widget) for widget_id, widget in self.widgets.items()}
+        self._resetters = {widget_id: _by_type(RESETTERS, widget) for widget_id, widget in self.widgets.items()}
+
+    def read(self) -> tuple:
+        widgets = self.widgets
+        readers = self._readers
+        inputs = []
+        for arg in self.view.args:
+            if isinstance(arg, tuple):
+                inputs.append(tuple(readers[widget_id](widgets[widget_id]) for widget_id in arg))
+            else:
+                inputs.append(readers[arg](widgets[arg]))
+        return tuple(inputs)
+
+    def write(self, inputs: tuple):
+        """Put inputs returned by `read` back into the widgets."""
+        widgets = self.widgets
+        writers = self._writers
+        for arg, value in zip(self.view.args, inputs):
+            if isinstance(arg, tuple):
+                for widget_id, item in zip(arg, value):
+                    writers[widget_id](widgets[widget_id], item)
+            else:
+                writers[arg](widgets[arg], value)
+
+    def reset(self, keep: bool = True):
+        """Clear the inputs, except those the view keeps unless `keep` is False."""
+        for widget_id, reset in self._resetters.items():
+            if not keep or widget_id not in self.view.keep:
+                reset(self.widgets[widget_id])
+
+    def apply_titles(self, root: DOMNode):
+        for widget_id, title in self.view.titles.items():
+            root.query_one(f"#{widget_id}").border_title = title
+
+def bind(views: Iterable[ModuleView], root: DOMNode) -> dict[str, BoundModule]:
+    return {view.name: BoundModule(view, root) for view in views}
+
+def index_inputs(modules: Iterable[BoundModule]) -> dict[str, str]:
+    """Map every input widget id to the module it belongs to."""
+    return {widget_id: bound.view.name for bound in modules for widget_id in bound.widgets}
@@ -0,0 +1,83 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import Any
+
+class RenderStats:
+    __slots__ = ("shown", "unchanged", "replaced", "updates", "batches")
+
+    def __init__(self):
+        # Texts handed to the renderer, and those dropped as already on screen or replaced before the next frame
+        self.shown = 0
+        self.unchanged = 0
+        self.replaced = 0
+        # Label updates made, and the batches they were made in
+        self.updates = 0
+        self.batches = 0
+
+    @property
+    def avoided(self) -> int:
+        """The repaints saved against updating a label for every text, each in its own refresh."""
+        return self.unchanged + self.replaced + self.updates - self.batches
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "shown": self.shown,
+            "unchanged": self.unchanged,
+            "replaced": self.replaced,
+            "updates": self.updates,
+            "batches": self.batches,
+            "avoided": self.avoided,
+        }
+
+class AnswerRenderer:
+    """Writes answer texts to their labels, only when they change and all in one refresh.
+
+    `update` writes a module's text to its label, `batch` holds the repaint until
+    it exits (the app's `batch_update`) and `schedule` runs a callback once the
+    current message is handled (the screen's `call_next`). `shown` is the text
+    each label starts with.
+    """
+
+    def __init__(
+        self,
+        update: Callable[[str, str], Any],
+        batch: Callable[[], AbstractContextManager],
+        schedule: Callable[[Callable[[], Any]], Any],
+        shown: dict[str, str] | None = None
+    ):
+        self.update = update
+        self.batch = batch
+        self.schedule = schedule
+
+        self.shown: dict[str, str] = dict(shown or {})
+        self.pending: dict[str, str] = {}
+        self.stats = RenderStats()
+
+    def show(self, module: str, text: str):
+        stats = self.stats
+        stats.shown += 1
+
+        if module in self.pending:
+            # The text waiting for this label is never drawn
+            del self.pending[module]
+            stats.replaced += 1
+        if self.shown.get(module) == text:
+            stats.unchanged += 1
+            return
+
+        if not self.pending:
+            self.schedule(self.flush)
+        self.pending[module] = text
+
+    def flush(self):
+        pending = self.pending
+        if not pending:
+            return
+        self.pending = {}
+
+        with self.batch():
+            for module, text in pending.items():
+                self.update(module, text)
+                self.shown[module] = text
+        self.stats.updates += len(pending)
+        self.stats.batches += 1
@@ -0,0 +1,89 @@
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+class ModuleStats:
+    __slots__ = ("events", "solves", "skipped")
+
+    def __init__(self):
+        # Input events received, recomputes run and recomputes skipped as unchanged
+        self.events = 0
+        self.solves = 0
+        self.skipped = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"events": self.events, "solves": self.solves, "skipped": self.skipped}
+
+class RecomputeScheduler:
+    """Coalesces input events into at most one recompute per module per frame.
+
+    `read` returns a module's normalized, hashable inputs, `render` solves and shows
+    them, and `schedule` runs a callback once the next frame has been drawn (the
+    screen's `call_after_refresh`). Modules whose inputs did not change since they
+    were last rendered are skipped. `on_render` is told when the first event that
+    dirtied a rendered module arrived.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[str], Hashable],
+        render: Callable[[str, Hashable], Any],
+        schedule: Callable[[Callable[[], Any]], Any],
+        on_render: Callable[[str, float], Any] | None = None
+    ):
+        self.read = read
+        self.render = render
+        self.schedule = schedule
+        self.on_render = on_render
+
+        # Dirty modules and when they were first marked
+        self.dirty: dict[str, float] = {}
+        self.last_inputs: dict[str, Hashable] = {}
+        self.stats: dict[str, ModuleStats] = {}
+        self.pending = False
+
+    def mark(self, *modules: str, force: bool = False):
+        for module in modules:
+            stats = self.stats.get(module)
+            if stats is None:
+                stats = self.stats[module] = ModuleStats()
+            stats.events += 1
+
+            if force:
+                self.last_inputs.pop(module, None)
+            if module not in self.dirty:
+                self.dirty[module] = time.perf_counter()
+
+        if self.dirty and not self.pending:
+            self.pending = True
+            self.schedule(self.flush)
+
+    def flush(self):
+        self.pending = False
+        dirty = self.dirty
+        self.dirty = {}
+
+        for module, marked in dirty.items():
+            self.run(module, marked)
+
+    def run(self, module: str, marked: float | None = None):
+        inputs = self.read(module)
+        stats = self.stats.setdefault(module, ModuleStats())
+
+        if module in self.last_inputs and self.last_inputs[module] == inputs:
+            stats.skipped += 1
+            return
+
+        self.last_inputs[module] = inputs
+        stats.solves += 1
+        self.render(module, inputs)
+        if self.on_render is not None and marked is not None:
+            self.on_render(module, marked)
+
+    def totals(self) -> dict[str, int]:
+        totals = ModuleStats()
+        for stats in self.stats.values():
+            totals.events += stats.events
+            totals.solves += stats.solves
+            totals.skipped += stats.skipped
+        return totals.as_dict()
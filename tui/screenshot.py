@@ -0,0 +1,46 @@
+from textual import on
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import Input, Static
+
+class ScreenshotPrompt(ModalScreen[str | None]):
+    """Asks for the path of a screenshot of the module on the active tab."""
+
+    CSS = """
+    ScreenshotPrompt {
+        align: center middle;
+    }
+
+    #screenshot-frame {
+        width: 80%;
+        height: auto;
+        padding: 1 2;
+        border: round $primary;
+        background: $surface;
+    }
+    """
+
+    BINDINGS = [
+        Binding('escape', 'cancel', 'Cancel')
+    ]
+
+    def __init__(self, module: str):
+        super().__init__()
+        self.module = module
+
+    def compose(self) -> ComposeResult:
+        with Container(id="screenshot-frame"):
+            yield Input(placeholder="Path to the screenshot", id="screenshot-path")
+            yield Static("Snip only the module's face, PNG needs Pillow, PPM and .npy are read as they are")
+
+    def on_mount(self) -> None:
+        self.query_one("#screenshot-frame").border_title = f"Screenshot of the {self.module}"
+
+    @on(Input.Submitted)
+    def submitted(self, event: Input.Submitted):
+        self.dismiss(event.value.strip().strip('"') or None)
+
+    def action_cancel(self):
+        self.dismiss(None)
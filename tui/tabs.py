@@ -0,0 +1,24 @@
+from collections.abc import Callable
+
+from textual.app import ComposeResult
+from textual.widgets import TabPane
+
+class ModulePane(TabPane):
+    """A tab whose widgets come from `content`, composed with the tab or, when lazy, the first time it is opened."""
+
+    def __init__(self, title: str, content: Callable[[], ComposeResult], lazy: bool = False, id: str | None = None):
+        super().__init__(title, id=id)
+        self.content = content
+        self.composed = not lazy
+
+    def compose(self) -> ComposeResult:
+        if self.composed:
+            yield from self.content()
+
+    async def expand(self) -> bool:
+        """Compose and mount the content of a lazy tab, returning False when it already was."""
+        if self.composed:
+            return False
+        self.composed = True
+        await self.recompose()
+        return True